@@ -16,6 +16,28 @@ from models.building import Building, Window
 
 logger = logging.getLogger(__name__)
 
+# Node name keywords suggesting a window (case-insensitive; 'win' also covers 'window')
+WINDOW_NAME_RE = re.compile(r'win|окно|glazing|glass', re.IGNORECASE)
+
+# Scene graph container/group node names (lowercase) - not actual building elements
+CONTAINER_NODE_NAMES = frozenset({
+    'floors', 'windows', 'doors', 'walls', 'columns', 'curtainwalls',
+    'mechanicalequipment', 'genericmodel', 'этажи', 'окна', 'двери', 'стены',
+})
+# Node types not worth logging during scene graph organisation
+UNLOGGED_NODE_TYPES = frozenset({'unknown', 'container'})
+# Node type keyword groups, matched against lowercased node names in one scan
+# (the group name of each match is the node type it suggests)
+NODE_TYPE_KEYWORDS_RE = re.compile(
+    r'(?P<building>building|корпус|здание)'
+    r'|(?P<floor>floor|этаж)'  # also covers 'o_floor'
+    r'|(?P<apartment>apartment|квартира|premises)'
+    r'|(?P<room>living room|kitchen|bedroom|bathroom|npki|комната|гостиная|кухня|спальня)'
+    r'|(?P<window>window|окно)'
+)
+# Room-like names with numbers (e.g. "NPKI 202", "Living room 1288")
+NUMBERED_ROOM_RE = re.compile(r'(npki|living|kitchen|room|комната)\s*\d+')
+
 # Try to import Open3D for advanced 3D processing
 try:
     import open3d as o3d
@@ -1521,7 +1543,7 @@ class GLBImporter(BaseImporter):
             # Log node identification for debugging (first 100 nodes)
             total_identified = len(organized['rooms']) + len(organized['windows']) + len(organized['floors']) + len(organized['apartments'])
             if total_identified < 100:
-                if node_type not in ['unknown', 'container']:
+                if node_type not in UNLOGGED_NODE_TYPES:
                     logger.info(f"Node '{node_name}' -> type: {node_type}, id: {node_id}")
             
             # Skip container nodes (they're just organizational, not actual building elements)
@@ -1610,16 +1632,18 @@ class GLBImporter(BaseImporter):
         name_lower = node_name.lower()
         
         # Skip container/group nodes (these are not actual building elements)
-        if name_lower in ['floors', 'windows', 'doors', 'walls', 'columns', 'curtainwalls', 
-                          'mechanicalequipment', 'genericmodel', 'этажи', 'окна', 'двери', 'стены']:
+        if name_lower in CONTAINER_NODE_NAMES:
             return 'container', None
         
+        # Scan the name once for all keyword groups, then apply them in priority order
+        found = {match.lastgroup for match in NODE_TYPE_KEYWORDS_RE.finditer(name_lower)}
+        
         # Building patterns (including Russian)
-        if any(pattern in name_lower for pattern in ['building', 'корпус', 'здание']):
+        if 'building' in found:
             return 'building', self._extract_id(node_name)
         
         # Floor patterns (but not container "Floors")
-        if any(pattern in name_lower for pattern in ['floor', 'этаж', 'o_floor']):
+        if 'floor' in found:
             # Check if it's a specific floor (has a number) vs container
             if re.search(r'\d+', node_name):
                 return 'floor', self._extract_id(node_name)
@@ -1627,19 +1651,18 @@ class GLBImporter(BaseImporter):
                 return 'container', None
         
         # Apartment patterns
-        if any(pattern in name_lower for pattern in ['apartment', 'квартира', 'premises']):
+        if 'apartment' in found:
             return 'apartment', self._extract_id(node_name)
         
         # Room patterns (more specific)
-        if any(pattern in name_lower for pattern in ['living room', 'kitchen', 'bedroom', 'bathroom', 
-                                                     'npki', 'комната', 'гостиная', 'кухня', 'спальня']):
+        if 'room' in found:
             return 'room', self._extract_id(node_name)
         # Also check for room-like patterns with numbers (e.g., "NPKI 202", "Living room 1288")
-        if re.search(r'(npki|living|kitchen|room|комната)\s*\d+', name_lower):
+        if NUMBERED_ROOM_RE.search(name_lower):
             return 'room', self._extract_id(node_name)
         
         # Window patterns (but not container "Windows")
-        if any(pattern in name_lower for pattern in ['window', 'окно']):
+        if 'window' in found:
             # Check if it's a specific window (has a number) vs container
             if re.search(r'\d+', node_name) or 'window' in name_lower:
                 return 'window', self._extract_id(node_name)
@@ -1980,11 +2003,7 @@ class GLBImporter(BaseImporter):
             node_name = node.get('name', f"Node_{node_idx}")
             
             # Check if node name suggests it's a window
-            name_suggests_window = False
-            if node_name:
-                name_lower = node_name.lower()
-                if any(pattern in name_lower for pattern in ['window', 'окно', 'win', 'glazing', 'glass']):
-                    name_suggests_window = True
+            name_suggests_window = bool(node_name) and WINDOW_NAME_RE.search(node_name) is not None
             
             # Analyze geometry
             bounds = geometry.bounds
@@ -2221,11 +2240,7 @@ class GLBImporter(BaseImporter):
             node_name = node.get('name', f"Node_{node_idx}")
             
             # Check if name suggests window
-            name_suggests_window = False
-            if node_name:
-                name_lower = node_name.lower()
-                if any(pattern in name_lower for pattern in ['window', 'окно', 'win', 'glazing', 'glass']):
-                    name_suggests_window = True
+            name_suggests_window = bool(node_name) and WINDOW_NAME_RE.search(node_name) is not None
             
             # Analyze geometry
             bounds = geometry.bounds
@@ -5,12 +5,19 @@ using semantic data and relationships, avoiding heavy geometry processing.
 """
 
 from typing import List, Dict, Optional, Tuple
+from collections import Counter
+import dataclasses
+import functools
 import logging
+import math
+import os
+import re
 import ifcopenshell
 from ifcopenshell import geom
 import numpy as np
 
 from .base_importer import BaseImporter
+from .ifc_kernels import apply_affine, window_shape_score, SHAPE_REJECTED, SHAPE_TYPICAL
 from models.building import Building, Window
 
 # Try to import trimesh for mesh generation
@@ -31,6 +38,238 @@ MAX_WINDOW_HEIGHT = 10.0  # Maximum window height (10m - very tall windows)
 MIN_WINDOW_AREA = 0.01  # Minimum window area (0.01 m² = 100 cm²)
 MAX_WINDOW_AREA = 50.0  # Maximum window area (50 m² - very large windows)
 
+# Duplicate window detection (_remove_duplicate_windows)
+DUPLICATE_MAX_DISTANCE = 0.5  # Windows closer than this (metres) with similar size are duplicates
+DUPLICATE_SIZE_TOLERANCE = 0.1  # Sizes are similar within 10%
+DUPLICATE_KDTREE_MIN_WINDOWS = 500  # From this many windows, find close pairs with a KD-tree instead of all pairs
+
+# Name keywords identifying glazing materials (case-insensitive, matched anywhere in the name)
+GLAZING_KEYWORDS_RE = re.compile(r'glass|glazing|verre|стекло|vitrage|pane', re.IGNORECASE)
+# Name keywords identifying window-like elements ('pane' also covers 'panel')
+WINDOW_KEYWORDS_RE = re.compile(r'window|окно|glazing|glass|fenetre|fenster|pane|vitrage', re.IGNORECASE)
+# Name keywords identifying doors (openings named like this are not treated as windows)
+DOOR_KEYWORDS_RE = re.compile(r'door|дверь|porte|tür|entrance|вход', re.IGNORECASE)
+
+# Glazing types recognised from IfcWindowType names, checked in order (first match wins)
+WINDOW_GLAZING_TYPES = (
+    (('single', 'однокамерный'), {'window_type': 'single_glazed', 'glass_thickness': 4.0, 'transmittance': 0.85, 'frame_factor': 0.75}),
+    (('double', 'двухкамерный'), {'window_type': 'double_glazed', 'glass_thickness': 6.0, 'transmittance': 0.75, 'frame_factor': 0.70}),
+    (('triple', 'трехкамерный'), {'window_type': 'triple_glazed', 'glass_thickness': 8.0, 'transmittance': 0.65, 'frame_factor': 0.65}),
+)
+
+# Size estimates from IfcWindowType name keywords (lowercase), per dimension in metres,
+# used when a window's size is not available; checked in order (first match wins)
+WINDOW_WIDTH_ESTIMATES = ((('large', 'wide'), 2.0), (('small', 'narrow'), 0.8))
+WINDOW_HEIGHT_ESTIMATES = ((('tall', 'high'), 2.0), (('short', 'low'), 0.8))
+DEFAULT_WINDOW_WIDTH = 1.5  # Standard window width
+DEFAULT_WINDOW_HEIGHT = 1.2  # Standard window height
+
+# Relations from a representation item to the IfcStyledItem(s) that style it
+# ('HasStyledItem' is an alternative relationship name used by some exporters)
+STYLED_ITEM_ATTRS = ('StyledByItem', 'HasStyledItem')
+
+# Element types checked for glazing materials during material/geometry-based window detection
+WINDOW_CANDIDATE_TYPES = (
+    "IfcPlate",  # Glazing panels
+    "IfcMember",  # Window frames
+    "IfcBuildingElementProxy",  # Generic elements
+    "IfcCurtainWall",  # Curtain walls (often have windows)
+    "IfcCurtainWallPanel",  # Curtain wall panels
+    "IfcBuildingElementPart",  # Building element parts
+)
+# Subset of WINDOW_CANDIDATE_TYPES that is also checked for window-like geometry
+GEOMETRY_CANDIDATE_TYPES = frozenset({
+    "IfcPlate",  # Glazing panels
+    "IfcMember",  # Window frames (sometimes windows are just frames)
+    "IfcBuildingElementProxy",  # Generic elements that might be windows
+})
+# Exact is_a() names of window elements (IfcWindow and its IFC4 StandardCase subtype)
+WINDOW_ELEMENT_TYPES = frozenset({"IfcWindow", "IfcWindowStandardCase"})
+# Exact is_a() names of window parts (glazing panels and frame members) whose colour
+# can stand in for the window's; includes the IFC4 StandardCase subtypes
+WINDOW_PART_TYPES = frozenset({
+    "IfcPlate", "IfcPlateStandardCase",
+    "IfcMember", "IfcMemberStandardCase",
+})
+# Exact is_a() names of elements rendered semi-transparent when colour assignment fails
+TRANSPARENT_FALLBACK_TYPES = frozenset({
+    "IfcWindow",
+    "IfcPlate", "IfcPlateStandardCase",
+    "IfcOpeningElement", "IfcOpeningStandardCase",
+})
+# 3D representations (by RepresentationIdentifier) retried for mesh generation when the default
+# Body representation yields no geometry; Box, Axis, FootPrint etc. are never used for meshes
+FALLBACK_REPRESENTATION_IDS = frozenset({"Body-FallBack", "Facetation"})
+
+
+def _unwrap(value):
+    """Return the Python value of an IFC measure/value wrapper (or the value itself)."""
+    return getattr(value, 'wrappedValue', value)
+
+
+def _read_single_value(prop):
+    """IfcPropertySingleValue -> nominal value, or None if unset."""
+    value = getattr(prop, 'NominalValue', None)
+    return _unwrap(value) if value else None
+
+
+def _read_bounded_value(prop):
+    """IfcPropertyBoundedValue -> {'max': ..., 'min': ...}, or None if neither bound is set."""
+    bounded_value = {}
+    upper = getattr(prop, 'UpperBoundValue', None)
+    if upper:
+        bounded_value['max'] = _unwrap(upper)
+    lower = getattr(prop, 'LowerBoundValue', None)
+    if lower:
+        bounded_value['min'] = _unwrap(lower)
+    return bounded_value or None
+
+
+def _read_enumerated_value(prop):
+    """IfcPropertyEnumeratedValue -> list of values, or None if empty."""
+    values = getattr(prop, 'EnumerationValues', None)
+    return [_unwrap(v) for v in values] if values else None
+
+
+def _read_list_value(prop):
+    """IfcPropertyListValue -> list of values, or None if empty."""
+    values = getattr(prop, 'ListValues', None)
+    return [_unwrap(v) for v in values] if values else None
+
+
+def _read_table_value(prop):
+    """IfcPropertyTableValue -> {'defining': [...], 'defined': [...]}, or None if both are empty."""
+    table_data = {
+        'defining': [_unwrap(v) for v in getattr(prop, 'DefiningValues', None) or ()],
+        'defined': [_unwrap(v) for v in getattr(prop, 'DefinedValues', None) or ()]
+    }
+    return table_data if table_data['defining'] or table_data['defined'] else None
+
+
+def _read_reference_value(prop):
+    """IfcPropertyReferenceValue -> string form of the referenced object."""
+    return str(getattr(prop, 'PropertyReference', None))
+
+
+# Element attributes copied into the extracted properties when set (IfcWindow/IfcDoor)
+OVERALL_SIZE_ATTRS = ('OverallWidth', 'OverallHeight', 'OverallDepth')
+# Property value readers by exact is_a() name of the IfcProperty subtype
+PROPERTY_VALUE_READERS = {
+    "IfcPropertySingleValue": _read_single_value,
+    "IfcPropertyBoundedValue": _read_bounded_value,
+    "IfcPropertyEnumeratedValue": _read_enumerated_value,
+    "IfcPropertyListValue": _read_list_value,
+    "IfcPropertyTableValue": _read_table_value,
+    "IfcPropertyReferenceValue": _read_reference_value,
+}
+# Value attribute and conversion by exact is_a() name of the IfcPhysicalQuantity subtype
+QUANTITY_VALUE_ATTRS = {
+    "IfcQuantityLength": ('LengthValue', float),
+    "IfcQuantityArea": ('AreaValue', float),
+    "IfcQuantityVolume": ('VolumeValue', float),
+    "IfcQuantityWeight": ('WeightValue', float),
+    "IfcQuantityCount": ('CountValue', int),
+    "IfcQuantityTime": ('TimeValue', float),
+}
+
+# Row-major affine part (first 3 rows) of the 4x4 identity transform, with the tolerance
+# used to treat a shape transformation as identity
+AFFINE_IDENTITY = (1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+IDENTITY_TOLERANCE = 1e-6
+
+
+def _as_flat_array(data, dtype) -> np.ndarray:
+    """
+    Array view of geometry verts/faces data without an extra copy when it exposes a buffer.
+    
+    Expected inputs are ifcopenshell Triangulation data: tuples of numbers (verts/faces, converted
+    as before), typed buffers (converted from their own element type), or raw byte buffers
+    (verts_buffer/faces_buffer), which must already hold native float64 vertex coordinates or
+    int32 face indices and are reinterpreted as dtype without conversion.
+    The returned array may be read-only.
+    
+    Raises:
+        ValueError: If a raw byte buffer is not a whole number of dtype elements
+    """
+    try:
+        buffer = memoryview(data)
+    except TypeError:
+        return np.asarray(data, dtype=dtype)
+    if buffer.format in ('B', 'b', 'c'):
+        if buffer.nbytes % np.dtype(dtype).itemsize != 0:
+            raise ValueError(f"Raw geometry buffer of {buffer.nbytes} bytes is not a whole number of {np.dtype(dtype).name} values")
+        return np.frombuffer(buffer, dtype=dtype)
+    return np.asarray(buffer).astype(dtype, copy=False)
+
+
+def _unit_axis(matrix: np.ndarray, start: int) -> Optional[Tuple[float, float, float]]:
+    """Normalized axis matrix[start:start + 3] of a flat transformation matrix, or None if it has zero length."""
+    axis = matrix[start:start + 3]
+    norm_length = float(np.linalg.norm(axis))
+    if norm_length > 1e-6:
+        return tuple((axis / norm_length).tolist())
+    return None
+
+
+# Number of opened IFC files kept by extract_element_mesh (each can hold a large model in memory)
+ELEMENT_MESH_FILE_CACHE_SIZE = 2
+
+
+@functools.lru_cache(maxsize=ELEMENT_MESH_FILE_CACHE_SIZE)
+def _open_ifc_cached(ifc_file_path: str, mtime: float):
+    """Open an IFC file once per (path, modification time); a changed file is reopened."""
+    return ifcopenshell.open(ifc_file_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _geometry_settings(use_world_coords: bool = False):
+    """
+    Geometry settings for per-element create_shape calls, configured once per option set.
+    The returned object is shared and must not be modified by callers.
+    """
+    settings = geom.settings()
+    if use_world_coords:
+        # Use world coordinates (if available in this version)
+        try:
+            if hasattr(settings, 'USE_WORLD_COORDS'):
+                settings.set(settings.USE_WORLD_COORDS, True)
+        except Exception:
+            pass  # Some versions don't have this setting
+    return settings
+
+
+@functools.lru_cache(maxsize=1)
+def _element_mesh_settings():
+    """
+    Geometry settings for extract_element_mesh, configured once.
+    CRITICAL: Uses the SAME settings as main mesh generation to ensure coordinate system consistency.
+    """
+    settings = geom.settings()
+    try:
+        # Enable world coordinates (same as main mesh generation)
+        if hasattr(settings, 'USE_WORLD_COORDS'):
+            settings.set(settings.USE_WORLD_COORDS, True)
+    except Exception as e:
+        logger.debug(f"Could not enable world coordinates: {e}")
+    
+    # Use the same additional settings as main mesh generation for consistency
+    try:
+        if hasattr(settings, 'USE_BREP_DATA'):
+            settings.set(settings.USE_BREP_DATA, True)
+        if hasattr(settings, 'USE_PYTHON_OPENCASCADE'):
+            settings.set(settings.USE_PYTHON_OPENCASCADE, False)
+        if hasattr(settings, 'SEW_SHELLS'):
+            settings.set(settings.SEW_SHELLS, True)
+        if hasattr(settings, 'DISABLE_OPENING_SUBTRACTION'):
+            settings.set(settings.DISABLE_OPENING_SUBTRACTION, False)
+        if hasattr(settings, 'USE_MATERIAL_COLOR'):
+            settings.set(settings.USE_MATERIAL_COLOR, True)
+        if hasattr(settings, 'WELD_VERTICES'):
+            settings.set(settings.WELD_VERTICES, False)
+    except Exception as e:
+        logger.debug(f"Some geometry settings could not be configured: {e}")
+    return settings
+
 
 class IFCImporter(BaseImporter):
     """
@@ -53,6 +292,21 @@ class IFCImporter(BaseImporter):
         self.schema_version: Optional[str] = None
         self.mesh = None  # 3D mesh for viewer display
         self.ifc_elements = {}  # Store IFC elements for tree viewer (spaces, storeys, walls, etc.)
+        self._by_type_cache: Dict[str, list] = {}  # by_type() results for the opened file
+        self._geometry_window_cache: Dict[int, Optional[Window]] = {}  # element id -> geometry-based window (or None)
+        self._fills_index: Optional[Tuple[Dict[int, list], Dict[int, list]]] = None  # IfcRelFillsElement lookups (see _get_fills_index)
+        self._styled_item_attrs_by_type: Dict[str, tuple] = {}  # item type -> STYLED_ITEM_ATTRS it actually has
+        self._properties_cache: Dict[int, Dict] = {}  # element id -> _extract_properties() result
+        self._material_cache: Dict[int, Dict] = {}  # element id -> _extract_material_properties() result
+        self._color_style_cache: Dict[int, Dict] = {}  # element id -> _extract_color_and_style() result
+        self._styled_items_by_item: Optional[Dict[int, list]] = None  # representation item id -> IfcStyledItems (see _get_styled_items_index)
+        self._spatial_index: Optional[Tuple[Dict[int, list], Dict[int, object]]] = None  # IfcRelContainedInSpatialStructure lookups (see _get_spatial_index)
+        self._window_type_cache: Dict[int, Dict] = {}  # IfcWindowType id -> recognize_window_type() result
+        self._placement_coord_cache: Dict[int, Optional[Tuple[float, float, float]]] = {}  # placement id -> _get_absolute_coordinates() result
+        self._window_filled_opening_ids = set()  # Openings filled by an IfcWindow (per extract_windows run)
+        self._detected_global_ids = set()  # GlobalIds already turned into windows (per extract_windows run)
+        self._detected_ifc_ids = set()  # Step ids (as str) already turned into windows (per extract_windows run)
+        self._visited_elem_ids = set()  # Element ids already extracted or definitively rejected (per extract_windows run)
     
     def import_model(self) -> List[Building]:
         """
@@ -65,6 +319,17 @@ class IFCImporter(BaseImporter):
             logger.info(f"Opening IFC file: {self.file_path}")
             try:
                 self.ifc_file = ifcopenshell.open(self.file_path)
+                self._by_type_cache = {}
+                self._geometry_window_cache = {}
+                self._fills_index = None
+                self._styled_item_attrs_by_type = {}
+                self._properties_cache = {}
+                self._material_cache = {}
+                self._color_style_cache = {}
+                self._styled_items_by_item = None
+                self._spatial_index = None
+                self._window_type_cache = {}
+                self._placement_coord_cache = {}
                 logger.info("IFC file opened successfully")
             except FileNotFoundError:
                 error_msg = f"IFC file not found: {self.file_path}"
@@ -103,7 +368,7 @@ class IFCImporter(BaseImporter):
         
         # Get all building elements
         try:
-            buildings_elements = self.ifc_file.by_type("IfcBuilding")
+            buildings_elements = self._cached_by_type("IfcBuilding")
             logger.info(f"Found {len(buildings_elements)} IfcBuilding element(s)")
         except Exception as e:
             logger.error(f"Error getting building elements: {e}", exc_info=True)
@@ -187,11 +452,11 @@ class IFCImporter(BaseImporter):
             
             # Extract spaces (rooms)
             try:
-                spaces = self.ifc_file.by_type("IfcSpace")
+                spaces = self._cached_by_type("IfcSpace")
                 for space in spaces:
                     space_info = {
-                        'id': space.GlobalId if hasattr(space, 'GlobalId') else str(space.id()),
-                        'name': space.Name if hasattr(space, 'Name') else f"Space {space.id()}",
+                        'id': getattr(space, 'GlobalId', None) or str(space.id()),
+                        'name': getattr(space, 'Name', None) or f"Space {space.id()}",
                         'element': space
                     }
                     self.ifc_elements['spaces'].append(space_info)
@@ -201,11 +466,11 @@ class IFCImporter(BaseImporter):
             
             # Extract storeys (floors)
             try:
-                storeys = self.ifc_file.by_type("IfcBuildingStorey")
+                storeys = self._cached_by_type("IfcBuildingStorey")
                 for storey in storeys:
                     storey_info = {
-                        'id': storey.GlobalId if hasattr(storey, 'GlobalId') else str(storey.id()),
-                        'name': storey.Name if hasattr(storey, 'Name') else f"Storey {storey.id()}",
+                        'id': getattr(storey, 'GlobalId', None) or str(storey.id()),
+                        'name': getattr(storey, 'Name', None) or f"Storey {storey.id()}",
                         'element': storey
                     }
                     self.ifc_elements['storeys'].append(storey_info)
@@ -215,11 +480,12 @@ class IFCImporter(BaseImporter):
             
             # Extract walls
             try:
-                walls = self.ifc_file.by_type("IfcWall") + self.ifc_file.by_type("IfcWallStandardCase")
+                # by_type("IfcWall") already includes IfcWallStandardCase (and other subtypes)
+                walls = self._cached_by_type("IfcWall")
                 for wall in walls:
                     wall_info = {
-                        'id': wall.GlobalId if hasattr(wall, 'GlobalId') else str(wall.id()),
-                        'name': wall.Name if hasattr(wall, 'Name') else f"Wall {wall.id()}",
+                        'id': getattr(wall, 'GlobalId', None) or str(wall.id()),
+                        'name': getattr(wall, 'Name', None) or f"Wall {wall.id()}",
                         'element': wall
                     }
                     self.ifc_elements['walls'].append(wall_info)
@@ -229,11 +495,11 @@ class IFCImporter(BaseImporter):
             
             # Extract doors
             try:
-                doors = self.ifc_file.by_type("IfcDoor")
+                doors = self._cached_by_type("IfcDoor")
                 for door in doors:
                     door_info = {
-                        'id': door.GlobalId if hasattr(door, 'GlobalId') else str(door.id()),
-                        'name': door.Name if hasattr(door, 'Name') else f"Door {door.id()}",
+                        'id': getattr(door, 'GlobalId', None) or str(door.id()),
+                        'name': getattr(door, 'Name', None) or f"Door {door.id()}",
                         'element': door
                     }
                     self.ifc_elements['doors'].append(door_info)
@@ -243,11 +509,11 @@ class IFCImporter(BaseImporter):
             
             # Extract openings
             try:
-                openings = self.ifc_file.by_type("IfcOpeningElement")
+                openings = self._cached_by_type("IfcOpeningElement")
                 for opening in openings:
                     opening_info = {
-                        'id': opening.GlobalId if hasattr(opening, 'GlobalId') else str(opening.id()),
-                        'name': opening.Name if hasattr(opening, 'Name') else f"Opening {opening.id()}",
+                        'id': getattr(opening, 'GlobalId', None) or str(opening.id()),
+                        'name': getattr(opening, 'Name', None) or f"Opening {opening.id()}",
                         'element': opening
                     }
                     self.ifc_elements['openings'].append(opening_info)
@@ -257,11 +523,11 @@ class IFCImporter(BaseImporter):
             
             # Extract slabs (floors/ceilings)
             try:
-                slabs = self.ifc_file.by_type("IfcSlab")
+                slabs = self._cached_by_type("IfcSlab")
                 for slab in slabs:
                     slab_info = {
-                        'id': slab.GlobalId if hasattr(slab, 'GlobalId') else str(slab.id()),
-                        'name': slab.Name if hasattr(slab, 'Name') else f"Slab {slab.id()}",
+                        'id': getattr(slab, 'GlobalId', None) or str(slab.id()),
+                        'name': getattr(slab, 'Name', None) or f"Slab {slab.id()}",
                         'element': slab
                     }
                     self.ifc_elements['slabs'].append(slab_info)
@@ -274,8 +540,8 @@ class IFCImporter(BaseImporter):
     
     def _extract_building(self, building_elem) -> Optional[Building]:
         """Extract building from IFC element."""
-        building_id = building_elem.GlobalId if hasattr(building_elem, 'GlobalId') else str(building_elem.id())
-        building_name = building_elem.Name if hasattr(building_elem, 'Name') else f"Building {building_id}"
+        building_id = getattr(building_elem, 'GlobalId', None) or str(building_elem.id())
+        building_name = getattr(building_elem, 'Name', None) or f"Building {building_id}"
         
         building = Building(
             id=building_id,
@@ -297,240 +563,366 @@ class IFCImporter(BaseImporter):
         Checks multiple window representations:
         - IfcWindow (direct window elements)
         - IfcOpeningElement (openings that might be windows)
+        - IfcPlate (glazing panels)
         - Windows embedded in walls
+        - Elements with glazing materials or window-like geometry
         
         Returns:
             List of Window objects
         """
         windows = []
+        # Detection state shared by the detectors below (reset for every run)
+        # Openings already filled by an IfcWindow, collected from the window side
+        # (IfcWindow.FillsVoids) so openings don't have to walk their fillings
+        self._window_filled_opening_ids = set()
+        # GlobalIds (or stringified ids) of elements already turned into windows
+        self._detected_global_ids = set()
+        # Step ids (ifc_element_id) of elements already turned into windows; checked
+        # before GlobalId so already-detected elements skip the attribute read
+        self._detected_ifc_ids = set()
+        # Element ids already extracted or definitively rejected by a detector,
+        # so later detectors reaching the same element (e.g. wall openings) skip it;
+        # openings are only recorded once they produced a window or their IfcWindow did
+        self._visited_elem_ids = set()
         
-        # Method 1: Get all direct window elements
-        try:
-            window_elements = self.ifc_file.by_type("IfcWindow")
-            logger.info(f"Found {len(window_elements)} IfcWindow element(s) in IFC file")
-            
-            for window_elem in window_elements:
-                try:
-                    window = self._extract_window(window_elem)
-                    if window:
-                        windows.append(window)
-                    else:
-                        logger.warning(f"Failed to extract window {window_elem.id()}")
-                except Exception as e:
-                    logger.error(f"Error extracting window {window_elem.id()}: {e}", exc_info=True)
-        except Exception as e:
-            logger.warning(f"Error getting IfcWindow elements: {e}")
+        # Detectors run in order; each returns the windows it found. They are not run
+        # concurrently: later detectors depend on state from earlier ones (filled
+        # openings, visited/detected ids), and ifcopenshell entity access (inverse
+        # attributes in particular) is not safe to share between threads.
+        detectors = [
+            # Method 1: Direct window elements
+            ("IfcWindow elements", self._detect_ifc_windows),
+            # Method 2: Openings (IfcOpeningElement)
+            ("openings", self._detect_opening_windows),
+            # Method 2b: Glazing panels (IfcPlate)
+            ("glazing panels", self._detect_plate_windows),
+            # Method 3: Openings in walls (checked even if we found some windows)
+            ("walls", self._extract_windows_from_walls),
+            # Method 4: Material- and geometry-based detection
+            ("material/geometry-based detection", self._detect_product_windows),
+        ]
+        for description, detector in detectors:
+            try:
+                found = detector()
+            except Exception as e:
+                logger.warning(f"Error extracting windows from {description}: {e}")
+                continue
+            if found:
+                windows.extend(found)
+                # One pass over the new windows records both ids
+                for w in found:
+                    window_props = w.properties
+                    self._detected_global_ids.add(window_props['ifc_global_id'])
+                    self._detected_ifc_ids.add(window_props['ifc_element_id'])
+                logger.info(f"Extracted {len(found)} window(s) from {description}")
+        
+        # Remove duplicates based on position and size
+        windows = self._remove_duplicate_windows(windows)
+        
+        logger.info(f"Successfully extracted {len(windows)} window(s) total (after deduplication)")
+        return windows
+    
+    def _detect_ifc_windows(self) -> List[Window]:
+        """
+        Extract windows from direct IfcWindow elements.
+        Also records the openings these windows fill.
+        
+        Returns:
+            List of Window objects
+        """
+        windows = []
+        window_elements = self._cached_by_type("IfcWindow")
+        logger.info(f"Found {len(window_elements)} IfcWindow element(s) in IFC file")
+        
+        for window_elem in window_elements:
+            step_id = window_elem.id()
+            try:
+                filled_opening_ids = []
+                for fills_rel in getattr(window_elem, 'FillsVoids', None) or ():
+                    opening = getattr(fills_rel, 'RelatingOpeningElement', None)
+                    if opening:
+                        filled_opening_ids.append(opening.id())
+                self._window_filled_opening_ids.update(filled_opening_ids)
+                
+                window = self._extract_window(window_elem)
+                if window:
+                    windows.append(window)
+                    # The openings are covered by this window; if it failed, the wall
+                    # detector can still recover them through their host wall
+                    self._visited_elem_ids.update(filled_opening_ids)
+                else:
+                    logger.warning(f"Failed to extract window {step_id}")
+            except Exception as e:
+                logger.error(f"Error extracting window {step_id}: {e}", exc_info=True)
         
-        # Method 2: Extract windows from openings (IfcOpeningElement)
-        # AGGRESSIVE: Extract ALL openings as potential windows unless explicitly doors
+        return windows
+    
+    def _detect_opening_windows(self) -> List[Window]:
+        """
+        Extract windows from openings (IfcOpeningElement).
+        AGGRESSIVE: Extracts ALL openings as potential windows unless explicitly doors.
+        
+        Returns:
+            List of Window objects
+        """
         logger.info("Checking for IfcOpeningElement (openings that might be windows)...")
-        try:
-            opening_elements = self.ifc_file.by_type("IfcOpeningElement")
-            logger.info(f"Found {len(opening_elements)} IfcOpeningElement(s)")
-            
-            opening_windows = []
-            for opening_elem in opening_elements:
-                try:
-                    # Check if this opening is already filled by an IfcWindow
-                    is_filled_by_window = False
-                    if hasattr(opening_elem, 'HasFillings'):
-                        for filling_rel in opening_elem.HasFillings:
-                            if hasattr(filling_rel, 'RelatedBuildingElement'):
-                                if filling_rel.RelatedBuildingElement.is_a("IfcWindow"):
-                                    is_filled_by_window = True
-                                    break
-                    
-                    # Only extract if not already filled by a window (to avoid duplicates)
-                    if not is_filled_by_window:
-                        window = self._extract_window_from_opening(opening_elem)
-                        if window:
-                            opening_windows.append(window)
-                except Exception as e:
-                    logger.debug(f"Error extracting window from opening {opening_elem.id()}: {e}")
-            
-            if opening_windows:
-                windows.extend(opening_windows)
-                logger.info(f"Extracted {len(opening_windows)} window(s) from openings")
-        except Exception as e:
-            logger.warning(f"Error getting IfcOpeningElement: {e}")
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        opening_elements = self._cached_by_type("IfcOpeningElement")
+        logger.info(f"Found {len(opening_elements)} IfcOpeningElement(s)")
+        
+        # Only extract openings not already filled by a window (to avoid duplicates)
+        filled_opening_ids = self._window_filled_opening_ids
+        unfilled_openings = [opening for opening in opening_elements if opening.id() not in filled_opening_ids]
+        
+        windows = []
+        for opening_elem in unfilled_openings:
+            try:
+                window = self._extract_window_from_opening(opening_elem)
+                if window:
+                    windows.append(window)
+                    self._visited_elem_ids.add(opening_elem.id())
+            except Exception as e:
+                if debug_enabled:
+                    logger.debug("Error extracting window from opening %s: %s", opening_elem.id(), e)
         
-        # Method 2b: Extract windows from glazing panels (IfcPlate)
-        # Many IFC files store windows as IfcPlate elements (glazing panels)
+        return windows
+    
+    def _detect_plate_windows(self) -> List[Window]:
+        """
+        Extract windows from glazing panels (IfcPlate).
+        Many IFC files store windows as IfcPlate elements (glazing panels).
+        
+        Returns:
+            List of Window objects
+        """
         logger.info("Checking for IfcPlate elements (glazing panels that might be windows)...")
-        try:
-            plates = self.ifc_file.by_type("IfcPlate")
-            logger.info(f"Found {len(plates)} IfcPlate element(s)")
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        plates = self._cached_by_type("IfcPlate")
+        logger.info(f"Found {len(plates)} IfcPlate element(s)")
+        
+        windows = []
+        for plate in plates:
+            step_id = plate.id()
+            try:
+                # Check if plate might be a window (glazing panel)
+                plate_name = getattr(plate, 'Name', None) or ""
+                
+                # Check for window-related keywords
+                is_window_like = WINDOW_KEYWORDS_RE.search(plate_name) is not None
+                
+                # Also check material - if it's glass or transparent, likely a window
+                material_props = self._extract_material_properties_cached(plate)
+                is_glass = False
+                if material_props:
+                    is_glass = GLAZING_KEYWORDS_RE.search(material_props.get('name') or '') is not None
+                
+                # Extract if it looks like a window
+                if is_window_like or is_glass:
+                    window = self._extract_window_from_plate(plate)
+                    if window:
+                        windows.append(window)
+                        logger.info("Extracted window from plate '%s' (ID: %s)", plate_name, step_id)
+            except Exception as e:
+                if debug_enabled:
+                    logger.debug("Error extracting window from plate %s: %s", step_id, e)
+        
+        return windows
+    
+    def _detect_product_windows(self) -> List[Window]:
+        """
+        Material- and geometry-based window detection (single pass).
+        Many windows are identified only by their glazing materials (DEEP material analysis),
+        others only by window-like geometry (elements not properly classified in IFC).
+        Both checks share one traversal so every candidate is classified once and
+        extracted at most once.
+        
+        Returns:
+            List of Window objects
+        """
+        logger.info("Performing material- and geometry-based window detection...")
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        info_enabled = logger.isEnabledFor(logging.INFO)
+        detected_global_ids = self._detected_global_ids
+        detected_ifc_ids = self._detected_ifc_ids
+        material_based_count = 0
+        windows = []
+        
+        for candidate_type in WINDOW_CANDIDATE_TYPES:
+            try:
+                elements = self._cached_by_type(candidate_type)
+            except Exception as e:
+                if debug_enabled:
+                    logger.debug("Error getting %s elements: %s", candidate_type, e)
+                continue
+            
+            logger.info("Checking %d %s element(s) for window materials and geometry...", len(elements), candidate_type)
+            check_geometry = candidate_type in GEOMETRY_CANDIDATE_TYPES
             
-            plate_windows = []
-            for plate in plates:
+            for elem in elements:
+                step_id = elem.id()
+                ifc_id = str(step_id)
+                elem_type = elem.is_a()
                 try:
-                    # Check if plate might be a window (glazing panel)
-                    plate_name = plate.Name if hasattr(plate, 'Name') else ""
-                    plate_name_lower = plate_name.lower() if plate_name else ""
+                    # Skip if already detected by an earlier method
+                    if ifc_id in detected_ifc_ids:
+                        continue
+                    elem_id = getattr(elem, 'GlobalId', None) or ifc_id
+                    if elem_id in detected_global_ids:
+                        continue
+                    
+                    # DEEP material extraction
+                    material_props = self._extract_material_properties_cached(elem)
                     
-                    # Check for window-related keywords
-                    is_window_like = any(keyword in plate_name_lower for keyword in [
-                        'window', 'окно', 'glazing', 'glass', 'fenetre', 'fenster',
-                        'pane', 'panel', 'vitrage'
-                    ])
+                    # Check if element has glazing/glass materials
+                    has_glazing = self._has_glazing_material(material_props)
                     
-                    # Also check material - if it's glass or transparent, likely a window
-                    material_props = self._extract_material_properties(plate)
-                    is_glass = False
-                    if material_props:
-                        material_name = material_props.get('name', '').lower() if material_props.get('name') else ''
-                        is_glass = any(keyword in material_name for keyword in [
-                            'glass', 'glazing', 'verre', 'стекло', 'vitrage'
-                        ])
+                    # Glazing material is a strong indicator; otherwise fall back to geometry
+                    if has_glazing:
+                        if info_enabled:
+                            logger.info("Found glazing material in %s %s - treating as window", elem_type, step_id)
+                        detection_method = 'material_based'
+                    elif check_geometry and self._is_window_like_geometry(elem, material_props):
+                        detection_method = 'geometry_based'
+                    else:
+                        continue
                     
-                    # Extract if it looks like a window
-                    if is_window_like or is_glass:
-                        window = self._extract_window_from_plate(plate)
-                        if window:
-                            plate_windows.append(window)
-                            logger.info(f"Extracted window from plate '{plate_name}' (ID: {plate.id()})")
+                    window = self._extract_window_from_geometry_cached(elem)
+                    if window:
+                        window.properties['detection_method'] = detection_method
+                        if has_glazing:
+                            # Mark as detected by material
+                            window.properties['material'] = material_props
+                            material_based_count += 1
+                            if info_enabled:
+                                logger.info("Extracted window from %s %s based on glazing material", elem_type, step_id)
+                        elif info_enabled:
+                            logger.info("Detected window from %s %s using geometry analysis", elem_type, step_id)
+                        windows.append(window)
+                        detected_ifc_ids.add(ifc_id)
+                        detected_global_ids.add(elem_id)
                 except Exception as e:
-                    logger.debug(f"Error extracting window from plate {plate.id()}: {e}")
-            
-            if plate_windows:
-                windows.extend(plate_windows)
-                logger.info(f"Extracted {len(plate_windows)} window(s) from glazing panels")
-        except Exception as e:
-            logger.warning(f"Error getting IfcPlate elements: {e}")
+                    if debug_enabled:
+                        logger.debug("Error checking %s %s for window materials/geometry: %s", elem_type, step_id, e)
         
-        # Method 3: Extract windows from walls (openings in walls)
-        # Check walls even if we found some windows
-        logger.info("Checking walls for window openings...")
-        try:
-            wall_windows = self._extract_windows_from_walls()
-            if wall_windows:
-                windows.extend(wall_windows)
-                logger.info(f"Extracted {len(wall_windows)} window(s) from walls")
-        except Exception as e:
-            logger.warning(f"Error extracting windows from walls: {e}")
+        if windows:
+            logger.info(f"Material/geometry-based detection: {material_based_count} by material, "
+                        f"{len(windows) - material_based_count} by geometry")
+        return windows
+    
+    def _has_glazing_material(self, material_props: Dict) -> bool:
+        """
+        Check whether extracted material properties indicate glazing.
+        Returns on the first matching indicator.
         
-        # Method 4: Material-based window detection (DEEP material analysis)
-        # This is CRITICAL - many windows are identified by their glazing materials
-        logger.info("Performing material-based window detection (deep material analysis)...")
-        try:
-            # Get all building elements that might be windows based on materials
-            potential_window_elements = []
-            
-            # Check all building elements for glazing materials
-            element_types_to_check = [
-                "IfcPlate",  # Glazing panels
-                "IfcMember",  # Window frames
-                "IfcBuildingElementProxy",  # Generic elements
-                "IfcCurtainWall",  # Curtain walls (often have windows)
-                "IfcCurtainWallPanel",  # Curtain wall panels
-                "IfcBuildingElementPart"  # Building element parts
-            ]
-            
-            material_based_windows = []
-            for elem_type in element_types_to_check:
-                try:
-                    elements = self.ifc_file.by_type(elem_type)
-                    logger.info(f"Checking {len(elements)} {elem_type} element(s) for window materials...")
-                    
-                    for elem in elements:
-                        try:
-                            # DEEP material extraction
-                            material_props = self._extract_material_properties(elem)
-                            
-                            # Check if element has glazing/glass materials
-                            has_glazing = False
-                            
-                            # Check primary material
-                            if material_props:
-                                material_name = material_props.get('name', '').lower() if material_props.get('name') else ''
-                                if any(keyword in material_name for keyword in ['glass', 'glazing', 'verre', 'стекло', 'vitrage', 'pane']):
-                                    has_glazing = True
-                                
-                                # Check if material set has glazing
-                                if material_props.get('has_glazing') or material_props.get('is_window_material'):
-                                    has_glazing = True
-                                
-                                # Check constituents for glazing
-                                if 'constituents' in material_props:
-                                    for constituent in material_props['constituents']:
-                                        if constituent.get('is_glazing') or constituent.get('constituent_category', '').lower() == 'glazing':
-                                            has_glazing = True
-                                            break
-                                
-                                # Check layers for glazing
-                                if 'layers' in material_props:
-                                    for layer in material_props['layers']:
-                                        if layer.get('is_glazing'):
-                                            has_glazing = True
-                                            break
-                            
-                            # If element has glazing material, it's likely a window
-                            if has_glazing:
-                                logger.info(f"Found glazing material in {elem_type} {elem.id()} - treating as window")
-                                window = self._extract_window_from_geometry(elem)
-                                if window:
-                                    # Mark as detected by material
-                                    window.properties['detection_method'] = 'material_based'
-                                    window.properties['material'] = material_props
-                                    material_based_windows.append(window)
-                                    logger.info(f"Extracted window from {elem_type} {elem.id()} based on glazing material")
-                        except Exception as e:
-                            logger.debug(f"Error checking {elem_type} {elem.id()} for materials: {e}")
-                except Exception as e:
-                    logger.debug(f"Error getting {elem_type} elements: {e}")
-            
-            if material_based_windows:
-                windows.extend(material_based_windows)
-                logger.info(f"Extracted {len(material_based_windows)} window(s) using material-based detection")
-        except Exception as e:
-            logger.warning(f"Error in material-based window detection: {e}")
+        Args:
+            material_props: Material properties from _extract_material_properties
         
-        # Method 5: Geometry-based window detection (for elements that look like windows)
-        # This catches windows that aren't properly classified in IFC
-        logger.info("Performing geometry-based window detection...")
-        try:
-            # Get all building elements that might be windows
-            potential_window_types = [
-                "IfcPlate",  # Glazing panels
-                "IfcMember",  # Window frames (sometimes windows are just frames)
-                "IfcBuildingElementProxy"  # Generic elements that might be windows
-            ]
-            
-            geometry_windows = []
-            for elem_type in potential_window_types:
-                try:
-                    elements = self.ifc_file.by_type(elem_type)
-                    for elem in elements:
-                        try:
-                            # Skip if already detected by material
-                            elem_id = elem.GlobalId if hasattr(elem, 'GlobalId') else str(elem.id())
-                            already_detected = any(w.id.endswith(elem_id) for w in windows)
-                            
-                            if not already_detected:
-                                # Check if element looks like a window based on geometry
-                                if self._is_window_like_geometry(elem):
-                                    window = self._extract_window_from_geometry(elem)
-                                    if window:
-                                        geometry_windows.append(window)
-                                        logger.info(f"Detected window from {elem_type} {elem.id()} using geometry analysis")
-                        except Exception as e:
-                            logger.debug(f"Error checking {elem_type} {elem.id()} for window geometry: {e}")
-                except Exception as e:
-                    logger.debug(f"Error getting {elem_type} elements: {e}")
-            
-            if geometry_windows:
-                windows.extend(geometry_windows)
-                logger.info(f"Extracted {len(geometry_windows)} window(s) using geometry-based detection")
-        except Exception as e:
-            logger.warning(f"Error in geometry-based window detection: {e}")
+        Returns:
+            True if the primary material, material set, a constituent or a layer is glazing
+        """
+        if not material_props:
+            return False
         
-        # Remove duplicates based on position and size
-        windows = self._remove_duplicate_windows(windows)
+        # Check if material set has glazing (flags set during extraction, cheapest test)
+        if material_props.get('has_glazing') or material_props.get('is_window_material'):
+            return True
         
-        logger.info(f"Successfully extracted {len(windows)} window(s) total (after deduplication)")
-        return windows
+        # Check primary material
+        if GLAZING_KEYWORDS_RE.search(material_props.get('name') or ''):
+            return True
+        
+        # Check constituents for glazing
+        for constituent in material_props.get('constituents', ()):
+            if constituent.get('is_glazing') or constituent.get('constituent_category', '').lower() == 'glazing':
+                return True
+        
+        # Check layers for glazing
+        for layer in material_props.get('layers', ()):
+            if layer.get('is_glazing'):
+                return True
+        
+        return False
+    
+    @staticmethod
+    def _mentions_door(value) -> bool:
+        """
+        Check whether 'door' (any case) occurs in a property value, its keys or nested values.
+        Walks the structure and returns on the first hit instead of stringifying all of it.
+        
+        Args:
+            value: Property dict as returned by _extract_properties (or a nested value)
+        
+        Returns:
+            True if any key or leaf value mentions a door
+        """
+        if isinstance(value, dict):
+            return any(IFCImporter._mentions_door(k) or IFCImporter._mentions_door(v) for k, v in value.items())
+        if isinstance(value, (list, tuple, set)):
+            return any(IFCImporter._mentions_door(v) for v in value)
+        return 'door' in str(value).lower()
     
-    def _is_window_like_geometry(self, element) -> bool:
+    def _cached_by_type(self, ifc_type: str) -> list:
+        """
+        Get elements of an IFC type, querying the file only once per type.
+        The returned list is shared between callers and must not be modified.
+
+        Args:
+            ifc_type: IFC entity type name (e.g. "IfcPlate")
+
+        Returns:
+            List of IFC elements of that type (including subtypes)
+        """
+        elements = self._by_type_cache.get(ifc_type)
+        if elements is None:
+            elements = self.ifc_file.by_type(ifc_type)
+            self._by_type_cache[ifc_type] = elements
+        return elements
+
+    def _get_fills_index(self) -> Tuple[Dict[int, list], Dict[int, list]]:
+        """
+        Index IfcRelFillsElement relationships, built once per opened file.
+        Replaces walking HasFillings on every opening (or every opening for
+        every window) with dictionary lookups.
+
+        Returns:
+            Tuple of (opening id -> filling elements, filling element id -> openings)
+        """
+        if self._fills_index is None:
+            fillings_by_opening: Dict[int, list] = {}
+            openings_by_filling: Dict[int, list] = {}
+            for rel in self._cached_by_type("IfcRelFillsElement"):
+                opening = getattr(rel, 'RelatingOpeningElement', None)
+                filling = getattr(rel, 'RelatedBuildingElement', None)
+                if opening and filling:
+                    fillings_by_opening.setdefault(opening.id(), []).append(filling)
+                    openings_by_filling.setdefault(filling.id(), []).append(opening)
+            self._fills_index = (fillings_by_opening, openings_by_filling)
+        return self._fills_index
+
+    def _get_spatial_index(self) -> Tuple[Dict[int, list], Dict[int, object]]:
+        """
+        Index IfcRelContainedInSpatialStructure relationships, built once per opened file.
+        Replaces scanning every containment relationship per lookup.
+
+        Returns:
+            Tuple of (structure id -> contained elements, element id -> containing structure)
+        """
+        if self._spatial_index is None:
+            elements_by_structure: Dict[int, list] = {}
+            structure_by_element: Dict[int, object] = {}
+            for rel in self._cached_by_type("IfcRelContainedInSpatialStructure"):
+                structure = getattr(rel, 'RelatingStructure', None)
+                if not structure:
+                    continue
+                related = getattr(rel, 'RelatedElements', None) or ()
+                elements_by_structure.setdefault(structure.id(), []).extend(related)
+                for elem in related:
+                    # An element is contained in at most one structure; keep the first
+                    structure_by_element.setdefault(elem.id(), structure)
+            self._spatial_index = (elements_by_structure, structure_by_element)
+        return self._spatial_index
+
+    def _is_window_like_geometry(self, element, material_props: Optional[Dict] = None) -> bool:
         """
         Check if an element has window-like geometry characteristics.
         Windows are typically:
@@ -540,6 +932,8 @@ class IFCImporter(BaseImporter):
         
         Args:
             element: IFC element to check
+            material_props: Material properties already extracted for the element
+                (extracted here only if needed and not given)
         
         Returns:
             True if element looks like a window based on geometry
@@ -553,33 +947,24 @@ class IFCImporter(BaseImporter):
             
             width, height = size
             
-            # Check size constraints (reasonable window dimensions)
-            min_size = 0.3  # 30cm minimum
-            max_width = 5.0  # 5m maximum width
-            max_height = 4.0  # 4m maximum height
-            
-            if width < min_size or height < min_size:
-                return False
-            if width > max_width or height > max_height:
+            # Check size constraints (0.3m - 5m width, 0.3m - 4m height)
+            shape_score = window_shape_score(float(width), float(height))
+            if shape_score == SHAPE_REJECTED:
                 return False
             
-            # Check if element has transparent/glass material (strong indicator)
-            material_props = self._extract_material_properties(element)
-            if material_props:
-                material_name = material_props.get('name', '').lower() if material_props.get('name') else ''
-                if any(keyword in material_name for keyword in ['glass', 'glazing', 'verre', 'стекло']):
-                    return True
+            # Typical window size (0.5m - 2.5m in both directions) is enough on its own
+            if shape_score == SHAPE_TYPICAL:
+                return True
             
-            # Check name for window-related keywords
-            element_name = element.Name if hasattr(element, 'Name') else ''
-            if element_name:
-                name_lower = element_name.lower()
-                if any(keyword in name_lower for keyword in ['window', 'окно', 'glazing', 'glass', 'pane']):
-                    return True
+            # Check name for window-related keywords (cheap, so before material extraction)
+            element_name = getattr(element, 'Name', None) or ''
+            if WINDOW_KEYWORDS_RE.search(element_name):
+                return True
             
-            # If size is reasonable and in typical window range, consider it
-            # Windows are typically 0.5m - 2m wide and 0.5m - 2m high
-            if 0.5 <= width <= 2.5 and 0.5 <= height <= 2.5:
+            # Check if element has transparent/glass material (strong indicator)
+            if material_props is None:
+                material_props = self._extract_material_properties_cached(element)
+            if material_props and GLAZING_KEYWORDS_RE.search(material_props.get('name') or ''):
                 return True
             
             return False
@@ -598,15 +983,19 @@ class IFCImporter(BaseImporter):
             Window object or None if extraction fails
         """
         try:
-            element_id = element.GlobalId if hasattr(element, 'GlobalId') else str(element.id())
-            element_name = element.Name if hasattr(element, 'Name') else f"Element_{element_id}"
+            step_id = element.id()
+            element_id = getattr(element, 'GlobalId', None) or str(step_id)
+            element_name = getattr(element, 'Name', None) or f"Element_{element_id}"
             element_type = element.is_a()
             
-            logger.info(f"Extracting window from {element_type} {element_id}: {element_name}")
+            logger.info("Extracting window from %s %s: %s", element_type, element_id, element_name)
+            
+            # Extract properties (also the first source of the window size)
+            properties = self._extract_properties_cached(element)
             
             # Extract geometry
             try:
-                center, normal, size = self._extract_window_geometry(element)
+                center, normal, size = self._extract_window_geometry(element, properties)
                 # Early validation - reject if size is unreasonable
                 if not self._is_valid_window_size(size):
                     area = size[0] * size[1] if size[0] > 0 and size[1] > 0 else 0
@@ -620,30 +1009,15 @@ class IFCImporter(BaseImporter):
                 logger.warning(f"Failed to extract geometry from {element_type} {element_id}: {e}")
                 return None
             
-            # Extract properties
-            properties = self._extract_properties(element)
-            
             # Extract material properties
-            try:
-                material_props = self._extract_material_properties(element)
-                if material_props:
-                    properties['material'] = material_props
-            except Exception as e:
-                logger.debug(f"Error extracting material properties: {e}")
+            material_props = self._extract_material_properties_cached(element)
+            if material_props:
+                properties['material'] = material_props
             
             # Extract color/style
-            try:
-                color_style = self._extract_color_and_style(element)
-                if color_style:
-                    properties['color_style'] = color_style
-            except Exception as e:
-                logger.debug(f"Error extracting color/style: {e}")
-            
-            # Validate window size - reject unreasonable dimensions
-            if not self._is_valid_window_size(size):
-                area = size[0] * size[1] if size[0] > 0 and size[1] > 0 else 0
-                logger.warning(f"Element {element_id} ({element_type}) has unreasonable size {size} (area: {area:.2f} m²) - REJECTING as invalid window")
-                return None
+            color_style = self._extract_color_and_style_cached(element)
+            if color_style:
+                properties['color_style'] = color_style
             
             # Set window properties
             window_props = {
@@ -651,26 +1025,24 @@ class IFCImporter(BaseImporter):
                 'glass_thickness': 6.0,
                 'transmittance': 0.75,
                 'frame_factor': 0.70,
-                'source': element_type  # Mark source element type
+                'source': element_type,  # Mark source element type
+                **properties,
+                # Store IFC element reference for geometry extraction during highlighting
+                'ifc_element_id': str(step_id),
+                'ifc_global_id': element_id,
+                'ifc_element_type': element_type,
+                'ifc_file_path': self.file_path
             }
-            window_props.update(properties)
-            
-            # Store IFC element reference for geometry extraction during highlighting
-            window_props['ifc_element_id'] = str(element.id())
-            if hasattr(element, 'GlobalId'):
-                window_props['ifc_global_id'] = element.GlobalId
-            window_props['ifc_element_type'] = element_type
-            window_props['ifc_file_path'] = self.file_path
             
             window = Window(
                 id=f"{element_type}_{element_id}",
                 center=center,
                 normal=normal,
                 size=size,
-                window_type=window_props.get('window_type'),
-                glass_thickness=window_props.get('glass_thickness', 6.0),
-                transmittance=window_props.get('transmittance', 0.75),
-                frame_factor=window_props.get('frame_factor', 0.70),
+                window_type=window_props['window_type'],
+                glass_thickness=window_props['glass_thickness'],
+                transmittance=window_props['transmittance'],
+                frame_factor=window_props['frame_factor'],
                 properties=window_props
             )
             
@@ -680,10 +1052,33 @@ class IFCImporter(BaseImporter):
             logger.error(f"Error extracting window from geometry: {e}", exc_info=True)
             return None
     
+    def _extract_window_from_geometry_cached(self, element) -> Optional[Window]:
+        """
+        Extract window from element geometry, reusing earlier results for the same element.
+        Failed extractions (None) are cached too.
+        
+        Args:
+            element: IFC element
+        
+        Returns:
+            Window object (a copy with its own properties dict, callers may modify) or None if extraction fails
+        """
+        element_id = element.id()
+        if element_id in self._geometry_window_cache:
+            window = self._geometry_window_cache[element_id]
+        else:
+            window = self._extract_window_from_geometry(element)
+            self._geometry_window_cache[element_id] = window
+        if window is None:
+            return None
+        return dataclasses.replace(window, properties=dict(window.properties))
+    
     def _remove_duplicate_windows(self, windows: List[Window]) -> List[Window]:
         """
         Remove duplicate windows based on position and size.
         Windows are considered duplicates if they're very close (within 0.5m) and have similar size.
+        Windows from the same IFC element are not created twice in the first place: the detectors
+        skip elements already recorded in the detected-id sets (see extract_windows).
         
         Args:
             windows: List of Window objects
@@ -694,26 +1089,45 @@ class IFCImporter(BaseImporter):
         if len(windows) <= 1:
             return windows
         
-        unique_windows = []
-        for window in windows:
-            is_duplicate = False
-            for existing in unique_windows:
-                # Check if windows are very close (within 0.5m)
-                distance = np.sqrt(
-                    sum((a - b) ** 2 for a, b in zip(window.center, existing.center))
-                )
-                
-                # Check if sizes are similar (within 10%)
-                size_diff = abs(window.size[0] - existing.size[0]) + abs(window.size[1] - existing.size[1])
-                size_avg = (window.size[0] + window.size[1] + existing.size[0] + existing.size[1]) / 4
-                
-                if distance < 0.5 and size_diff < size_avg * 0.1:
-                    is_duplicate = True
-                    logger.debug(f"Removed duplicate window {window.id} (close to {existing.id})")
-                    break
-            
-            if not is_duplicate:
-                unique_windows.append(window)
+        centers = np.asarray([w.center for w in windows], dtype=np.float64)
+        sizes = np.asarray([w.size for w in windows], dtype=np.float64)
+        
+        # Windows with non-finite centers or sizes never match anything (and are always kept)
+        finite = np.flatnonzero(np.isfinite(centers).all(axis=1) & np.isfinite(sizes).all(axis=1))
+        
+        # Close pairs (first < second) among the finite windows: all pairs for small inputs,
+        # KD-tree neighbours (within DUPLICATE_MAX_DISTANCE) for large ones
+        if len(finite) < DUPLICATE_KDTREE_MIN_WINDOWS:
+            first, second = np.triu_indices(len(finite), k=1)
+        else:
+            from scipy.spatial import cKDTree
+            pairs = cKDTree(centers[finite]).query_pairs(r=DUPLICATE_MAX_DISTANCE, output_type='ndarray')
+            first, second = pairs[:, 0], pairs[:, 1]
+        first, second = finite[first], finite[second]
+        
+        # Check if windows are very close (squared distances, no sqrt needed)
+        sq_distances = ((centers[first] - centers[second]) ** 2).sum(axis=1)
+        
+        # Check if sizes are similar (within 10%)
+        size_diff = np.abs(sizes[first] - sizes[second]).sum(axis=1)
+        size_avg = (sizes[first].sum(axis=1) + sizes[second].sum(axis=1)) / 4
+        
+        matches = (sq_distances < DUPLICATE_MAX_DISTANCE ** 2) & (size_diff < size_avg * DUPLICATE_SIZE_TOLERANCE)
+        first, second = first[matches], second[matches]
+        
+        # Keep-first: a window is a duplicate if it matches an earlier window that was kept.
+        # Earlier windows are settled before later ones, so resolve in order of the later index.
+        is_kept = np.ones(len(windows), dtype=bool)
+        order = np.argsort(second, kind='stable')
+        first, second = first[order], second[order]
+        later, starts = np.unique(second, return_index=True)
+        for index, earlier in zip(later.tolist(), np.split(first, starts[1:])):
+            kept_earlier = earlier[is_kept[earlier]]
+            if kept_earlier.size:
+                is_kept[index] = False
+                logger.debug("Removed duplicate window %s (close to %s)", windows[index].id, windows[int(kept_earlier.min())].id)
+        
+        unique_windows = [window for window, kept in zip(windows, is_kept) if kept]
         
         if len(unique_windows) < len(windows):
             logger.info(f"Removed {len(windows) - len(unique_windows)} duplicate window(s)")
@@ -734,53 +1148,34 @@ class IFCImporter(BaseImporter):
         
         try:
             # Method 1: Use IfcRelContainedInSpatialStructure to find windows in this building
-            contained_rels = self.ifc_file.by_type("IfcRelContainedInSpatialStructure")
+            elements_by_structure, _ = self._get_spatial_index()
+            building_contents = elements_by_structure.get(building_elem.id(), ())
             
             # Get all storeys in this building
-            building_storeys = []
-            for rel in contained_rels:
-                if rel.RelatingStructure == building_elem:
-                    for elem in rel.RelatedElements:
-                        if elem.is_a("IfcBuildingStorey"):
-                            building_storeys.append(elem)
+            # (exact type-name compares; neither IfcBuildingStorey nor IfcSpace has subtypes)
+            building_storeys = [elem for elem in building_contents if elem.is_a() == "IfcBuildingStorey"]
             
             # Get all spaces in this building (through storeys)
-            building_spaces = []
-            for storey in building_storeys:
-                for rel in contained_rels:
-                    if rel.RelatingStructure == storey:
-                        for elem in rel.RelatedElements:
-                            if elem.is_a("IfcSpace"):
-                                building_spaces.append(elem)
-            
-            # Find windows contained in this building's spaces or storeys
-            window_ids_in_building = set()
-            for rel in contained_rels:
-                # Check if window is directly in building
-                if rel.RelatingStructure == building_elem:
-                    for elem in rel.RelatedElements:
-                        if elem.is_a("IfcWindow"):
-                            window_ids_in_building.add(elem.id())
-                
-                # Check if window is in building's storeys
-                if rel.RelatingStructure in building_storeys:
-                    for elem in rel.RelatedElements:
-                        if elem.is_a("IfcWindow"):
-                            window_ids_in_building.add(elem.id())
-                
-                # Check if window is in building's spaces
-                if rel.RelatingStructure in building_spaces:
-                    for elem in rel.RelatedElements:
-                        if elem.is_a("IfcWindow"):
-                            window_ids_in_building.add(elem.id())
+            building_spaces = [
+                elem
+                for storey in building_storeys
+                for elem in elements_by_structure.get(storey.id(), ())
+                if elem.is_a() == "IfcSpace"
+            ]
+            
+            # Find windows contained in this building, its storeys or its spaces
+            # (collected as elements, keyed by id so each window is extracted once)
+            windows_in_building = {}
+            for structure in [building_elem] + building_storeys + building_spaces:
+                for elem in elements_by_structure.get(structure.id(), ()):
+                    if elem.is_a() in WINDOW_ELEMENT_TYPES:
+                        windows_in_building.setdefault(elem.id(), elem)
             
             # Extract windows that belong to this building
-            all_windows = self.ifc_file.by_type("IfcWindow")
-            for window_elem in all_windows:
-                if window_elem.id() in window_ids_in_building:
-                    window = self._extract_window(window_elem)
-                    if window:
-                        windows.append(window)
+            for window_elem in windows_in_building.values():
+                window = self._extract_window(window_elem)
+                if window:
+                    windows.append(window)
             
             # If no windows found via relationships, try to find windows by spatial proximity
             if not windows:
@@ -818,16 +1213,19 @@ class IFCImporter(BaseImporter):
         
         # Check individual dimensions
         if width < MIN_WINDOW_WIDTH or width > MAX_WINDOW_WIDTH:
-            logger.debug(f"Window width {width:.2f}m is outside valid range [{MIN_WINDOW_WIDTH}, {MAX_WINDOW_WIDTH}]")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Window width {width:.2f}m is outside valid range [{MIN_WINDOW_WIDTH}, {MAX_WINDOW_WIDTH}]")
             return False
         
         if height < MIN_WINDOW_HEIGHT or height > MAX_WINDOW_HEIGHT:
-            logger.debug(f"Window height {height:.2f}m is outside valid range [{MIN_WINDOW_HEIGHT}, {MAX_WINDOW_HEIGHT}]")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Window height {height:.2f}m is outside valid range [{MIN_WINDOW_HEIGHT}, {MAX_WINDOW_HEIGHT}]")
             return False
         
         # Check area
         if area < MIN_WINDOW_AREA or area > MAX_WINDOW_AREA:
-            logger.debug(f"Window area {area:.2f}m² is outside valid range [{MIN_WINDOW_AREA}, {MAX_WINDOW_AREA}]")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Window area {area:.2f}m² is outside valid range [{MIN_WINDOW_AREA}, {MAX_WINDOW_AREA}]")
             return False
         
         return True
@@ -835,16 +1233,22 @@ class IFCImporter(BaseImporter):
     def _extract_window(self, window_elem) -> Optional[Window]:
         """Extract window from IFC window element."""
         try:
-            window_id = window_elem.GlobalId if hasattr(window_elem, 'GlobalId') else str(window_elem.id())
-            logger.debug(f"Extracting window {window_id}")
+            step_id = window_elem.id()
+            window_id = getattr(window_elem, 'GlobalId', None) or str(step_id)
+            logger.debug("Extracting window %s", window_id)
             
-            # Extract geometry
-            geometry = self._extract_geometry(window_elem)
+            # Extract all properties (enhanced - supports all IFC property types; also the first source of the size)
+            all_properties = self._extract_properties_cached(window_elem)
             
             # Extract center and size
             try:
-                center, normal, size = self._extract_window_geometry(window_elem)
-                logger.debug(f"Window {window_id}: center={center}, size={size}, normal={normal}")
+                center, normal, size = self._extract_window_geometry(window_elem, all_properties)
+                logger.debug("Window %s: center=%s, size=%s, normal=%s", window_id, center, size, normal)
+                # Validate before the material/colour walks so rejected windows skip them
+                if not self._is_valid_window_size(size):
+                    area = size[0] * size[1] if size[0] > 0 and size[1] > 0 else 0
+                    logger.warning(f"Window {window_id} has unreasonable size {size} (area: {area:.2f} m²) - REJECTING as invalid window")
+                    return None
             except ValueError as e:
                 # Invalid size - reject this window
                 logger.warning(f"Window {window_id} rejected due to invalid size: {e}")
@@ -860,61 +1264,22 @@ class IFCImporter(BaseImporter):
                     logger.warning(f"Window {window_id} default size is invalid - REJECTING")
                     return None
             
-            # Extract all properties (enhanced - supports all IFC property types)
-            try:
-                all_properties = self._extract_properties(window_elem)
-            except Exception as e:
-                logger.warning(f"Error extracting properties for window {window_id}: {e}")
-                all_properties = {}
-            
             # Extract material properties (DEEP comprehensive extraction)
-            try:
-                material_props = self._extract_material_properties(window_elem)
-                if material_props:
-                    all_properties['material'] = material_props
-                    # Log material information
-                    material_name = material_props.get('name', 'Unknown')
-                    material_type = material_props.get('type', 'Unknown')
-                    logger.info(f"Window {window_id}: Found material '{material_name}' (type: {material_type})")
-                    
-                    # Log detailed material information
-                    if 'constituents' in material_props:
-                        logger.info(f"Window {window_id}: Material has {len(material_props['constituents'])} constituent(s)")
-                        for i, const in enumerate(material_props['constituents']):
-                            const_name = const.get('name', 'Unknown')
-                            const_category = const.get('constituent_category', '')
-                            is_glazing = const.get('is_glazing', False)
-                            logger.info(f"  Constituent {i+1}: {const_name} (category: {const_category}, glazing: {is_glazing})")
-                    
-                    if 'layers' in material_props:
-                        logger.info(f"Window {window_id}: Material has {len(material_props['layers'])} layer(s)")
-                        for i, layer in enumerate(material_props['layers']):
-                            layer_name = layer.get('name', 'Unknown')
-                            is_glazing = layer.get('is_glazing', False)
-                            logger.info(f"  Layer {i+1}: {layer_name} (glazing: {is_glazing})")
-                    
-                    # Check for glazing materials
-                    if material_props.get('has_glazing') or material_props.get('is_window_material'):
-                        logger.info(f"Window {window_id}: Material contains glazing - confirmed as window")
-                    
-                    # If material has color, use it for color extraction
-                    if 'color_style' in material_props and 'color' in material_props['color_style']:
-                        logger.info(f"Window {window_id}: Material has color information")
-                else:
-                    # No material found - this is common for windows, not necessarily a problem
-                    # Only log at debug level, not warning
-                    logger.debug(f"Window {window_id}: No material properties found (using default/geometry-based detection)")
-            except Exception as e:
-                logger.warning(f"Error extracting material properties for window {window_id}: {e}", exc_info=True)
+            material_props = self._extract_material_properties_cached(window_elem)
+            if material_props:
+                all_properties['material'] = material_props
+                if logger.isEnabledFor(logging.INFO):
+                    self._log_material_summary(window_id, material_props)
+            else:
+                # No material found - this is common for windows, not necessarily a problem
+                # Only log at debug level, not warning
+                logger.debug("Window %s: No material properties found (using default/geometry-based detection)", window_id)
             
             # Extract color and style information
-            try:
-                color_style = self._extract_color_and_style(window_elem)
-                if color_style:
-                    all_properties['color_style'] = color_style
-                    logger.debug(f"Window {window_id}: extracted color/style - {color_style.get('style_type', 'unknown')}")
-            except Exception as e:
-                logger.debug(f"Error extracting color/style for window {window_id}: {e}")
+            color_style = self._extract_color_and_style_cached(window_elem)
+            if color_style:
+                all_properties['color_style'] = color_style
+                logger.debug("Window %s: extracted color/style - %s", window_id, color_style.get('style_type', 'unknown'))
             
             # Recognize window type and properties
             try:
@@ -931,16 +1296,9 @@ class IFCImporter(BaseImporter):
             # Merge all properties
             window_props.update(all_properties)
             
-            # Validate window data - check for reasonable dimensions
-            if not self._is_valid_window_size(size):
-                area = size[0] * size[1] if size[0] > 0 and size[1] > 0 else 0
-                logger.warning(f"Window {window_id} has unreasonable size {size} (area: {area:.2f} m²) - REJECTING as invalid window")
-                return None
-            
             # Store IFC element reference for geometry extraction during highlighting
-            window_props['ifc_element_id'] = str(window_elem.id())
-            if hasattr(window_elem, 'GlobalId'):
-                window_props['ifc_global_id'] = window_elem.GlobalId
+            window_props['ifc_element_id'] = str(step_id)
+            window_props['ifc_global_id'] = window_id
             window_props['ifc_element_type'] = window_elem.is_a()
             window_props['ifc_file_path'] = self.file_path  # Store file path for later geometry extraction
             
@@ -949,29 +1307,66 @@ class IFCImporter(BaseImporter):
                 center=center,
                 normal=normal,
                 size=size,
-                window_type=window_props.get('window_type'),
-                glass_thickness=window_props.get('glass_thickness', 4.0),
-                transmittance=window_props.get('transmittance', 0.75),
-                frame_factor=window_props.get('frame_factor', 0.70),
+                window_type=window_props['window_type'],
+                glass_thickness=window_props['glass_thickness'],
+                transmittance=window_props['transmittance'],
+                frame_factor=window_props['frame_factor'],
                 properties=window_props
             )
             
-            logger.debug(f"Successfully extracted window {window_id}: size={size}, center={center}")
+            logger.debug("Successfully extracted window %s: size=%s, center=%s", window_id, size, center)
             return window
             
         except Exception as e:
             logger.error(f"Failed to extract window {window_elem.id()}: {e}", exc_info=True)
             return None
     
+    def _log_material_summary(self, window_id: str, material_props: Dict):
+        """
+        Log the material found for a window, including its constituents and layers.
+        
+        Args:
+            window_id: Window identifier used in the log messages
+            material_props: Material properties from _extract_material_properties
+        """
+        try:
+            logger.info("Window %s: Found material '%s' (type: %s)", window_id,
+                        material_props.get('name', 'Unknown'), material_props.get('type', 'Unknown'))
+            
+            # Log detailed material information
+            constituents = material_props.get('constituents')
+            if constituents is not None:
+                logger.info("Window %s: Material has %d constituent(s)", window_id, len(constituents))
+                for i, const in enumerate(constituents, 1):
+                    logger.info("  Constituent %d: %s (category: %s, glazing: %s)", i, const.get('name', 'Unknown'),
+                                const.get('constituent_category', ''), const.get('is_glazing', False))
+            
+            layers = material_props.get('layers')
+            if layers is not None:
+                logger.info("Window %s: Material has %d layer(s)", window_id, len(layers))
+                for i, layer in enumerate(layers, 1):
+                    logger.info("  Layer %d: %s (glazing: %s)", i, layer.get('name', 'Unknown'), layer.get('is_glazing', False))
+            
+            # Check for glazing materials
+            if material_props.get('has_glazing') or material_props.get('is_window_material'):
+                logger.info("Window %s: Material contains glazing - confirmed as window", window_id)
+            
+            # If material has color, use it for color extraction
+            if 'color' in material_props.get('color_style', ()):
+                logger.info("Window %s: Material has color information", window_id)
+        except Exception as e:
+            logger.warning(f"Error logging material properties for window {window_id}: {e}", exc_info=True)
+    
     def recognize_window_type(self, window_element) -> Dict:
         """
         Recognize window type from IFC element properties.
+        Results are cached per IfcWindowType, since many windows usually share one type.
         
         Args:
             window_element: IFC window element
         
         Returns:
-            Dictionary with window properties
+            Dictionary with window properties (a fresh copy the caller may modify)
         """
         props = {
             'window_type': 'unknown',
@@ -981,30 +1376,61 @@ class IFCImporter(BaseImporter):
         }
         
         # Try to extract properties from IFC element
-        if hasattr(window_element, 'IsTypedBy') and window_element.IsTypedBy:
-            type_elem = window_element.IsTypedBy[0].RelatingType
-            if hasattr(type_elem, 'Name'):
-                type_name = type_elem.Name.lower()
+        typed_by = getattr(window_element, 'IsTypedBy', None)
+        if typed_by:
+            type_elem = typed_by[0].RelatingType
+            type_id = type_elem.id()
+            cached = self._window_type_cache.get(type_id)
+            if cached is not None:
+                return dict(cached)
+            
+            type_name = getattr(type_elem, 'Name', None)
+            if type_name:
+                type_name = type_name.lower()
                 
                 # Recognize common window types
-                if 'single' in type_name or 'однокамерный' in type_name:
-                    props['window_type'] = 'single_glazed'
-                    props['glass_thickness'] = 4.0
-                    props['transmittance'] = 0.85
-                    props['frame_factor'] = 0.75
-                elif 'double' in type_name or 'двухкамерный' in type_name:
-                    props['window_type'] = 'double_glazed'
-                    props['glass_thickness'] = 6.0
-                    props['transmittance'] = 0.75
-                    props['frame_factor'] = 0.70
-                elif 'triple' in type_name or 'трехкамерный' in type_name:
-                    props['window_type'] = 'triple_glazed'
-                    props['glass_thickness'] = 8.0
-                    props['transmittance'] = 0.65
-                    props['frame_factor'] = 0.65
+                for keywords, glazing_props in WINDOW_GLAZING_TYPES:
+                    if any(keyword in type_name for keyword in keywords):
+                        props.update(glazing_props)
+                        break
+            
+            self._window_type_cache[type_id] = dict(props)
         
         return props
     
+    def _extract_checked_window_geometry(self, element, properties: Dict, label: str,
+                                         element_id: str) -> Optional[Tuple[Tuple[float, float, float], Tuple[float, float, float], Tuple[float, float]]]:
+        """
+        Extract window geometry and reject unreasonable sizes.
+        If extraction fails for any other reason, a default geometry is used.
+        
+        Args:
+            element: IFC element the window is extracted from
+            properties: Properties already extracted for the element
+            label: Element kind used in log messages (e.g. "Opening", "Plate")
+            element_id: Element identifier used in log messages
+        
+        Returns:
+            Tuple of (center, normal, size), or None if the size is invalid
+        """
+        try:
+            center, normal, size = self._extract_window_geometry(element, properties)
+        except ValueError as e:
+            # Geometry extraction raised ValueError due to invalid size
+            logger.warning(f"{label} {element_id} rejected due to invalid size: {e}")
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to extract geometry from {label.lower()} {element_id}: {e}")
+            # Use defaults (a valid window size)
+            return (0.0, 0.0, 1.5), (0.0, 1.0, 0.0), (DEFAULT_WINDOW_WIDTH, DEFAULT_WINDOW_HEIGHT)
+        
+        # Reject if size is unreasonable
+        if not self._is_valid_window_size(size):
+            area = size[0] * size[1] if size[0] > 0 and size[1] > 0 else 0
+            logger.warning(f"{label} {element_id} has unreasonable size {size} (area: {area:.2f} m²) - REJECTING as invalid window")
+            return None
+        return center, normal, size
+    
     def _extract_window_from_opening(self, opening_elem) -> Optional[Window]:
         """
         Extract window from IfcOpeningElement.
@@ -1017,98 +1443,67 @@ class IFCImporter(BaseImporter):
             Window object or None if not a window
         """
         try:
-            opening_id = opening_elem.GlobalId if hasattr(opening_elem, 'GlobalId') else str(opening_elem.id())
-            opening_name = opening_elem.Name if hasattr(opening_elem, 'Name') else ""
+            step_id = opening_elem.id()
+            opening_id = getattr(opening_elem, 'GlobalId', None) or str(step_id)
+            opening_name = getattr(opening_elem, 'Name', None) or ""
             
             # AGGRESSIVE: Check if this opening is a door (exclude doors, include everything else as windows)
-            # Default to treating as window unless explicitly marked as door
-            is_door = False
+            # Default to treating as window unless explicitly marked as door.
+            # Cheapest checks first; properties are only extracted for openings that may be windows.
+            # Check if opening is filled by a door (indexed lookup)
+            fillings_by_opening, _ = self._get_fills_index()
+            is_door = any(filling.is_a("IfcDoor") for filling in fillings_by_opening.get(step_id, ()))
             
             # Check name for door keywords
-            if opening_name:
-                name_lower = opening_name.lower()
-                if any(keyword in name_lower for keyword in ['door', 'дверь', 'porte', 'tür', 'entrance', 'вход']):
-                    is_door = True
-            
-            # Check properties for door indication
-            properties = self._extract_properties(opening_elem)
-            if 'Door' in str(properties) or 'door' in str(properties).lower():
+            if not is_door and DOOR_KEYWORDS_RE.search(opening_name):
                 is_door = True
             
-            # Check if opening is filled by a door
-            if hasattr(opening_elem, 'HasFillings'):
-                for filling_rel in opening_elem.HasFillings:
-                    if hasattr(filling_rel, 'RelatedBuildingElement'):
-                        elem = filling_rel.RelatedBuildingElement
-                        if elem.is_a("IfcDoor"):
-                            is_door = True
-                            break
+            # Check properties for door indication
+            properties = None
+            if not is_door:
+                properties = self._extract_properties_cached(opening_elem)
+                is_door = self._mentions_door(properties)
             
             # Exclude only if explicitly a door
             if is_door:
-                logger.debug(f"Opening {opening_id} is a door, skipping")
+                logger.debug("Opening %s is a door, skipping", opening_id)
                 return None
             
-            logger.info(f"Extracting window from opening {opening_id}: {opening_name}")
+            logger.info("Extracting window from opening %s: %s", opening_id, opening_name)
             
-            # Extract geometry
-            try:
-                center, normal, size = self._extract_window_geometry(opening_elem)
-                # Early validation - reject if size is unreasonable
-                if not self._is_valid_window_size(size):
-                    area = size[0] * size[1] if size[0] > 0 and size[1] > 0 else 0
-                    logger.warning(f"Opening {opening_id} has unreasonable size {size} (area: {area:.2f} m²) - REJECTING as invalid window")
-                    return None
-            except ValueError as e:
-                # Geometry extraction raised ValueError due to invalid size
-                logger.warning(f"Opening {opening_id} rejected due to invalid size: {e}")
+            # Extract geometry (falls back to a default geometry if extraction fails)
+            geometry = self._extract_checked_window_geometry(opening_elem, properties, "Opening", opening_id)
+            if geometry is None:
                 return None
-            except Exception as e:
-                logger.warning(f"Failed to extract geometry from opening {opening_id}: {e}")
-                # Use defaults
-                center = (0.0, 0.0, 1.5)
-                normal = (0.0, 1.0, 0.0)
-                size = (1.5, 1.2)
-                # Validate defaults too
-                if not self._is_valid_window_size(size):
-                    logger.warning(f"Opening {opening_id} default size is invalid - REJECTING")
-                    return None
+            center, normal, size = geometry
             
             # Extract properties
             window_props = {
                 'window_type': 'unknown',
                 'glass_thickness': 4.0,
                 'transmittance': 0.75,
-                'frame_factor': 0.70
+                'frame_factor': 0.70,
+                **properties,
+                # Store IFC element reference for geometry extraction during highlighting
+                'ifc_element_id': str(step_id),
+                'ifc_global_id': opening_id,
+                'ifc_element_type': opening_elem.is_a(),
+                'ifc_file_path': self.file_path
             }
-            window_props.update(properties)
-            
-            # Validate window size - reject unreasonable dimensions
-            if not self._is_valid_window_size(size):
-                area = size[0] * size[1] if size[0] > 0 and size[1] > 0 else 0
-                logger.warning(f"Opening {opening_id} has unreasonable size {size} (area: {area:.2f} m²) - REJECTING as invalid window")
-                return None
-            
-            # Store IFC element reference for geometry extraction during highlighting
-            window_props['ifc_element_id'] = str(opening_elem.id())
-            if hasattr(opening_elem, 'GlobalId'):
-                window_props['ifc_global_id'] = opening_elem.GlobalId
-            window_props['ifc_element_type'] = opening_elem.is_a()
-            window_props['ifc_file_path'] = self.file_path
             
             window = Window(
                 id=f"Opening_{opening_id}",
                 center=center,
                 normal=normal,
                 size=size,
-                window_type=window_props.get('window_type'),
-                glass_thickness=window_props.get('glass_thickness', 4.0),
-                transmittance=window_props.get('transmittance', 0.75),
-                frame_factor=window_props.get('frame_factor', 0.70),
+                window_type=window_props['window_type'],
+                glass_thickness=window_props['glass_thickness'],
+                transmittance=window_props['transmittance'],
+                frame_factor=window_props['frame_factor'],
                 properties=window_props
             )
             
-            logger.debug(f"Successfully extracted window from opening {opening_id}")
+            logger.debug("Successfully extracted window from opening %s", opening_id)
             return window
             
         except Exception as e:
@@ -1127,57 +1522,29 @@ class IFCImporter(BaseImporter):
             Window object or None if extraction fails
         """
         try:
-            plate_id = plate_elem.GlobalId if hasattr(plate_elem, 'GlobalId') else str(plate_elem.id())
-            plate_name = plate_elem.Name if hasattr(plate_elem, 'Name') else f"Plate_{plate_id}"
-            logger.info(f"Extracting window from glazing panel {plate_id}: {plate_name}")
+            step_id = plate_elem.id()
+            plate_id = getattr(plate_elem, 'GlobalId', None) or str(step_id)
+            plate_name = getattr(plate_elem, 'Name', None) or f"Plate_{plate_id}"
+            logger.info("Extracting window from glazing panel %s: %s", plate_id, plate_name)
             
-            # Extract geometry
-            try:
-                center, normal, size = self._extract_window_geometry(plate_elem)
-                # Early validation - reject if size is unreasonable
-                if not self._is_valid_window_size(size):
-                    area = size[0] * size[1] if size[0] > 0 and size[1] > 0 else 0
-                    logger.warning(f"Plate {plate_id} has unreasonable size {size} (area: {area:.2f} m²) - REJECTING as invalid window")
-                    return None
-            except ValueError as e:
-                # Geometry extraction raised ValueError due to invalid size
-                logger.warning(f"Plate {plate_id} rejected due to invalid size: {e}")
-                return None
-            except Exception as e:
-                logger.warning(f"Failed to extract geometry from plate {plate_id}: {e}")
-                # Use defaults
-                center = (0.0, 0.0, 1.5)
-                normal = (0.0, 1.0, 0.0)
-                size = (1.5, 1.2)
-                # Validate defaults too
-                if not self._is_valid_window_size(size):
-                    logger.warning(f"Plate {plate_id} default size is invalid - REJECTING")
-                    return None
+            # Extract properties (also the first source of the window size)
+            properties = self._extract_properties_cached(plate_elem)
             
-            # Extract properties
-            properties = self._extract_properties(plate_elem)
+            # Extract geometry (falls back to a default geometry if extraction fails)
+            geometry = self._extract_checked_window_geometry(plate_elem, properties, "Plate", plate_id)
+            if geometry is None:
+                return None
+            center, normal, size = geometry
             
             # Extract material properties (important for glazing panels)
-            try:
-                material_props = self._extract_material_properties(plate_elem)
-                if material_props:
-                    properties['material'] = material_props
-            except Exception as e:
-                logger.debug(f"Error extracting material properties for plate {plate_id}: {e}")
+            material_props = self._extract_material_properties_cached(plate_elem)
+            if material_props:
+                properties['material'] = material_props
             
             # Extract color/style
-            try:
-                color_style = self._extract_color_and_style(plate_elem)
-                if color_style:
-                    properties['color_style'] = color_style
-            except Exception as e:
-                logger.debug(f"Error extracting color/style for plate {plate_id}: {e}")
-            
-            # Validate window size - reject unreasonable dimensions
-            if not self._is_valid_window_size(size):
-                area = size[0] * size[1] if size[0] > 0 and size[1] > 0 else 0
-                logger.warning(f"Plate {plate_id} has unreasonable size {size} (area: {area:.2f} m²) - REJECTING as invalid window")
-                return None
+            color_style = self._extract_color_and_style_cached(plate_elem)
+            if color_style:
+                properties['color_style'] = color_style
             
             # Set window properties (glazing panels are typically double-glazed)
             window_props = {
@@ -1185,30 +1552,28 @@ class IFCImporter(BaseImporter):
                 'glass_thickness': 6.0,
                 'transmittance': 0.75,
                 'frame_factor': 0.70,
-                'source': 'IfcPlate'  # Mark as extracted from plate
+                'source': 'IfcPlate',  # Mark as extracted from plate
+                **properties,
+                # Store IFC element reference for geometry extraction during highlighting
+                'ifc_element_id': str(step_id),
+                'ifc_global_id': plate_id,
+                'ifc_element_type': plate_elem.is_a(),
+                'ifc_file_path': self.file_path
             }
-            window_props.update(properties)
-            
-            # Store IFC element reference for geometry extraction during highlighting
-            window_props['ifc_element_id'] = str(plate_elem.id())
-            if hasattr(plate_elem, 'GlobalId'):
-                window_props['ifc_global_id'] = plate_elem.GlobalId
-            window_props['ifc_element_type'] = plate_elem.is_a()
-            window_props['ifc_file_path'] = self.file_path
             
             window = Window(
                 id=f"Plate_{plate_id}",
                 center=center,
                 normal=normal,
                 size=size,
-                window_type=window_props.get('window_type'),
-                glass_thickness=window_props.get('glass_thickness', 6.0),
-                transmittance=window_props.get('transmittance', 0.75),
-                frame_factor=window_props.get('frame_factor', 0.70),
+                window_type=window_props['window_type'],
+                glass_thickness=window_props['glass_thickness'],
+                transmittance=window_props['transmittance'],
+                frame_factor=window_props['frame_factor'],
                 properties=window_props
             )
             
-            logger.debug(f"Successfully extracted window from glazing panel {plate_id}")
+            logger.debug("Successfully extracted window from glazing panel %s", plate_id)
             return window
             
         except Exception as e:
@@ -1220,41 +1585,51 @@ class IFCImporter(BaseImporter):
         Extract windows from walls by finding openings.
         AGGRESSIVE: Extracts ALL openings from walls as potential windows.
         Checks IfcWall elements for openings that might be windows.
+        Recovers openings no earlier detector turned into a window, e.g. openings
+        filled by an IfcWindow whose own extraction failed.
         
         Returns:
             List of Window objects
         """
         windows = []
-        processed_openings = set()  # Track processed openings to avoid duplicates
+        # Openings already turned into windows (here, by their IfcWindow or by the
+        # opening detector) are skipped
+        processed_openings = self._visited_elem_ids
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         
         try:
             # Get all walls
-            walls = self.ifc_file.by_type("IfcWall") + self.ifc_file.by_type("IfcWallStandardCase")
+            # by_type("IfcWall") already includes IfcWallStandardCase (and other subtypes)
+            walls = self._cached_by_type("IfcWall")
             logger.info(f"Found {len(walls)} wall element(s)")
             
             # Check each wall for openings
             for wall in walls:
                 try:
                     # Check if wall has openings
-                    if hasattr(wall, 'HasOpenings') and wall.HasOpenings:
-                        for rel_opening in wall.HasOpenings:
-                            if hasattr(rel_opening, 'RelatedOpeningElement'):
-                                opening = rel_opening.RelatedOpeningElement
-                                if opening and opening.is_a("IfcOpeningElement"):
-                                    opening_id = opening.id()
-                                    
-                                    # Skip if already processed
-                                    if opening_id in processed_openings:
-                                        continue
-                                    processed_openings.add(opening_id)
-                                    
-                                    # Extract window from opening (aggressive - treats all as windows unless doors)
-                                    window = self._extract_window_from_opening(opening)
-                                    if window:
-                                        windows.append(window)
-                                        logger.info(f"Extracted window from wall opening {opening_id}")
+                    wall_openings = getattr(wall, 'HasOpenings', None)
+                    if wall_openings:
+                        for rel_opening in wall_openings:
+                            opening = getattr(rel_opening, 'RelatedOpeningElement', None)
+                            if not opening:
+                                continue
+                            opening_id = opening.id()
+                            
+                            # Skip if already processed (checked before the is_a() type test)
+                            if opening_id in processed_openings:
+                                continue
+                            processed_openings.add(opening_id)
+                            if not opening.is_a("IfcOpeningElement"):
+                                continue
+                            
+                            # Extract window from opening (aggressive - treats all as windows unless doors)
+                            window = self._extract_window_from_opening(opening)
+                            if window:
+                                windows.append(window)
+                                logger.info("Extracted window from wall opening %s", opening_id)
                 except Exception as e:
-                    logger.debug(f"Error checking wall {wall.id()} for openings: {e}")
+                    if debug_enabled:
+                        logger.debug("Error checking wall %s for openings: %s", wall.id(), e)
             
         except Exception as e:
             logger.warning(f"Error extracting windows from walls: {e}")
@@ -1273,11 +1648,31 @@ class IFCImporter(BaseImporter):
         }
         
         # Store GlobalId if available for reference
-        if hasattr(element, 'GlobalId'):
-            geometry['global_id'] = element.GlobalId
+        global_id = getattr(element, 'GlobalId', None)
+        if global_id is not None:
+            geometry['global_id'] = global_id
         
         return geometry
     
+    def _extract_properties_cached(self, element) -> Dict:
+        """
+        Extract all properties from IFC element, walking its property sets only once.
+        Window detection asks for the same element's properties several times
+        (size checks, extraction, type fallbacks shared by many windows).
+        
+        Args:
+            element: IFC element
+        
+        Returns:
+            Dictionary of properties (a copy callers may modify)
+        """
+        element_id = element.id()
+        properties = self._properties_cache.get(element_id)
+        if properties is None:
+            properties = self._extract_properties(element)
+            self._properties_cache[element_id] = properties
+        return dict(properties)
+    
     def _extract_properties(self, element) -> Dict:
         """
         Extract all properties from IFC element.
@@ -1293,141 +1688,59 @@ class IFCImporter(BaseImporter):
         properties = {}
         
         try:
+            # Walk the property definitions once, splitting property sets from quantity sets
+            # (quantities are applied after all properties, so they win on name clashes as before)
+            prop_sets = []
+            qty_sets = []
+            for rel in getattr(element, 'IsDefinedBy', None) or ():
+                if rel.is_a("IfcRelDefinesByProperties"):
+                    definition = rel.RelatingPropertyDefinition
+                    if definition.is_a("IfcPropertySet"):
+                        prop_sets.append(definition)
+                    elif definition.is_a("IfcElementQuantity"):
+                        qty_sets.append(definition)
+            
             # Method 1: Extract from IfcPropertySet (supports all property types)
-            if hasattr(element, 'IsDefinedBy'):
-                for rel in element.IsDefinedBy:
-                    if rel.is_a("IfcRelDefinesByProperties"):
-                        prop_set = rel.RelatingPropertyDefinition
-                        if prop_set.is_a("IfcPropertySet"):
-                            for prop in prop_set.HasProperties:
-                                prop_name = prop.Name if hasattr(prop, 'Name') else None
-                                if not prop_name:
-                                    continue
-                                
-                                # Handle different property types
-                                prop_type = prop.is_a()
-                                
-                                if prop_type == "IfcPropertySingleValue":
-                                    # Single value property
-                                    if hasattr(prop, 'NominalValue') and prop.NominalValue:
-                                        prop_value = prop.NominalValue
-                                        if hasattr(prop_value, 'wrappedValue'):
-                                            properties[prop_name] = prop_value.wrappedValue
-                                        else:
-                                            properties[prop_name] = prop_value
-                                
-                                elif prop_type == "IfcPropertyBoundedValue":
-                                    # Bounded value property (min/max range)
-                                    bounded_value = {}
-                                    if hasattr(prop, 'UpperBoundValue') and prop.UpperBoundValue:
-                                        if hasattr(prop.UpperBoundValue, 'wrappedValue'):
-                                            bounded_value['max'] = prop.UpperBoundValue.wrappedValue
-                                        else:
-                                            bounded_value['max'] = prop.UpperBoundValue
-                                    if hasattr(prop, 'LowerBoundValue') and prop.LowerBoundValue:
-                                        if hasattr(prop.LowerBoundValue, 'wrappedValue'):
-                                            bounded_value['min'] = prop.LowerBoundValue.wrappedValue
-                                        else:
-                                            bounded_value['min'] = prop.LowerBoundValue
-                                    if bounded_value:
-                                        properties[prop_name] = bounded_value
-                                
-                                elif prop_type == "IfcPropertyEnumeratedValue":
-                                    # Enumerated value property
-                                    if hasattr(prop, 'EnumerationValues') and prop.EnumerationValues:
-                                        enum_values = []
-                                        for enum_val in prop.EnumerationValues:
-                                            if hasattr(enum_val, 'wrappedValue'):
-                                                enum_values.append(enum_val.wrappedValue)
-                                            else:
-                                                enum_values.append(enum_val)
-                                        properties[prop_name] = enum_values
-                                
-                                elif prop_type == "IfcPropertyListValue":
-                                    # List value property
-                                    if hasattr(prop, 'ListValues') and prop.ListValues:
-                                        list_values = []
-                                        for list_val in prop.ListValues:
-                                            if hasattr(list_val, 'wrappedValue'):
-                                                list_values.append(list_val.wrappedValue)
-                                            else:
-                                                list_values.append(list_val)
-                                        properties[prop_name] = list_values
-                                
-                                elif prop_type == "IfcPropertyTableValue":
-                                    # Table value property
-                                    if hasattr(prop, 'DefiningValues') and hasattr(prop, 'DefinedValues'):
-                                        table_data = {
-                                            'defining': [],
-                                            'defined': []
-                                        }
-                                        if prop.DefiningValues:
-                                            for val in prop.DefiningValues:
-                                                if hasattr(val, 'wrappedValue'):
-                                                    table_data['defining'].append(val.wrappedValue)
-                                                else:
-                                                    table_data['defining'].append(val)
-                                        if prop.DefinedValues:
-                                            for val in prop.DefinedValues:
-                                                if hasattr(val, 'wrappedValue'):
-                                                    table_data['defined'].append(val.wrappedValue)
-                                                else:
-                                                    table_data['defined'].append(val)
-                                        if table_data['defining'] or table_data['defined']:
-                                            properties[prop_name] = table_data
-                                
-                                elif prop_type == "IfcPropertyReferenceValue":
-                                    # Reference value property
-                                    if hasattr(prop, 'PropertyReference'):
-                                        properties[prop_name] = str(prop.PropertyReference)
+            for prop_set in prop_sets:
+                for prop in prop_set.HasProperties:
+                    prop_name = getattr(prop, 'Name', None)
+                    if not prop_name:
+                        continue
+                    
+                    # Handle different property types (one dict lookup per property)
+                    reader = PROPERTY_VALUE_READERS.get(prop.is_a())
+                    if reader is not None:
+                        prop_value = reader(prop)
+                        if prop_value is not None:
+                            properties[prop_name] = prop_value
             
             # Method 2: Extract from IfcElementQuantity (quantities)
-            if hasattr(element, 'IsDefinedBy'):
-                for rel in element.IsDefinedBy:
-                    if rel.is_a("IfcRelDefinesByProperties"):
-                        qty_set = rel.RelatingPropertyDefinition
-                        if qty_set.is_a("IfcElementQuantity"):
-                            for qty in qty_set.Quantities:
-                                qty_name = qty.Name if hasattr(qty, 'Name') else None
-                                if not qty_name:
-                                    continue
-                                
-                                # Handle different quantity types
-                                qty_type = qty.is_a()
-                                
-                                if qty_type == "IfcQuantityLength":
-                                    if hasattr(qty, 'LengthValue') and qty.LengthValue is not None:
-                                        properties[qty_name] = float(qty.LengthValue)
-                                elif qty_type == "IfcQuantityArea":
-                                    if hasattr(qty, 'AreaValue') and qty.AreaValue is not None:
-                                        properties[qty_name] = float(qty.AreaValue)
-                                elif qty_type == "IfcQuantityVolume":
-                                    if hasattr(qty, 'VolumeValue') and qty.VolumeValue is not None:
-                                        properties[qty_name] = float(qty.VolumeValue)
-                                elif qty_type == "IfcQuantityWeight":
-                                    if hasattr(qty, 'WeightValue') and qty.WeightValue is not None:
-                                        properties[qty_name] = float(qty.WeightValue)
-                                elif qty_type == "IfcQuantityCount":
-                                    if hasattr(qty, 'CountValue') and qty.CountValue is not None:
-                                        properties[qty_name] = int(qty.CountValue)
-                                elif qty_type == "IfcQuantityTime":
-                                    if hasattr(qty, 'TimeValue') and qty.TimeValue is not None:
-                                        properties[qty_name] = float(qty.TimeValue)
-            
-            # Method 3: Extract common attributes directly
-            if hasattr(element, 'OverallWidth'):
-                properties['OverallWidth'] = float(element.OverallWidth)
-            if hasattr(element, 'OverallHeight'):
-                properties['OverallHeight'] = float(element.OverallHeight)
-            if hasattr(element, 'OverallDepth'):
-                properties['OverallDepth'] = float(element.OverallDepth)
+            for qty_set in qty_sets:
+                for qty in qty_set.Quantities:
+                    qty_name = getattr(qty, 'Name', None)
+                    if not qty_name:
+                        continue
+                    
+                    # Handle different quantity types (one dict lookup per quantity)
+                    value_spec = QUANTITY_VALUE_ATTRS.get(qty.is_a())
+                    if value_spec is not None:
+                        value_attr, convert = value_spec
+                        value = getattr(qty, value_attr, None)
+                        if value is not None:
+                            properties[qty_name] = convert(value)
+            
+            # Method 3: Extract common attributes directly (one fetch each; unset ones are skipped)
+            for attr_name in OVERALL_SIZE_ATTRS:
+                value = getattr(element, attr_name, None)
+                if value is not None:
+                    properties[attr_name] = float(value)
                 
         except Exception as e:
             logger.debug(f"Error extracting properties: {e}")
         
         return properties
     
-    def _extract_window_geometry(self, window_elem) -> Tuple[Tuple[float, float, float], Tuple[float, float, float], Tuple[float, float]]:
+    def _extract_window_geometry(self, window_elem, properties: Optional[Dict] = None) -> Tuple[Tuple[float, float, float], Tuple[float, float, float], Tuple[float, float]]:
         """
         Extract window center, normal, and size from IFC element.
         Uses multiple methods to ensure dimensions are ALWAYS extracted:
@@ -1435,9 +1748,15 @@ class IFCImporter(BaseImporter):
         2. Geometry extraction (if properties missing)
         3. Type definition properties (fallback)
         4. Reasonable defaults (last resort)
+        
+        Args:
+            window_elem: IFC element
+            properties: Properties already extracted for the element
+                (extracted here if not given)
         """
         # Try to extract from properties first (fastest)
-        properties = self._extract_properties(window_elem)
+        if properties is None:
+            properties = self._extract_properties_cached(window_elem)
         
         # Extract size from properties (try multiple property names)
         width = properties.get('OverallWidth') or properties.get('Width') or properties.get('NominalWidth') or properties.get('FrameWidth')
@@ -1457,12 +1776,13 @@ class IFCImporter(BaseImporter):
             height = None
         
         # Method 2: Try to get dimensions from window type if available
-        if (width is None or height is None or width <= 0 or height <= 0) and hasattr(window_elem, 'IsTypedBy') and window_elem.IsTypedBy:
+        type_rels = getattr(window_elem, 'IsTypedBy', None)
+        if (width is None or height is None or width <= 0 or height <= 0) and type_rels:
             try:
-                for type_rel in window_elem.IsTypedBy:
-                    if hasattr(type_rel, 'RelatingType') and type_rel.RelatingType:
-                        window_type = type_rel.RelatingType
-                        type_properties = self._extract_properties(window_type)
+                for type_rel in type_rels:
+                    window_type = getattr(type_rel, 'RelatingType', None)
+                    if window_type:
+                        type_properties = self._extract_properties_cached(window_type)
                         if not width or width <= 0:
                             width = type_properties.get('OverallWidth') or type_properties.get('Width') or type_properties.get('NominalWidth')
                             if width:
@@ -1500,43 +1820,25 @@ class IFCImporter(BaseImporter):
                 logger.info("Will use estimated dimensions based on window type or defaults")
         
         # Method 4: Use properties or reasonable defaults based on window type
+        # (type name read and lowercased once for both estimates)
+        window_type_name = ""
+        if type_rels and (width is None or width <= 0 or height is None or height <= 0):
+            try:
+                window_type_name = (getattr(getattr(type_rels[0], 'RelatingType', None), 'Name', None) or "").lower()
+            except:
+                pass
+        
         if width is None or width <= 0:
-            # Try to estimate from window type or use reasonable default
-            window_type_name = ""
-            if hasattr(window_elem, 'IsTypedBy') and window_elem.IsTypedBy:
-                try:
-                    type_rel = window_elem.IsTypedBy[0]
-                    if hasattr(type_rel, 'RelatingType') and hasattr(type_rel.RelatingType, 'Name'):
-                        window_type_name = type_rel.RelatingType.Name.lower() if type_rel.RelatingType.Name else ""
-                except:
-                    pass
-            
             # Estimate width based on window type
-            if 'large' in window_type_name or 'wide' in window_type_name:
-                width = 2.0
-            elif 'small' in window_type_name or 'narrow' in window_type_name:
-                width = 0.8
-            else:
-                width = 1.5  # Standard window width
-        
-        if height is None or height <= 0:
-            # Try to estimate from window type or use reasonable default
-            window_type_name = ""
-            if hasattr(window_elem, 'IsTypedBy') and window_elem.IsTypedBy:
-                try:
-                    type_rel = window_elem.IsTypedBy[0]
-                    if hasattr(type_rel, 'RelatingType') and hasattr(type_rel.RelatingType, 'Name'):
-                        window_type_name = type_rel.RelatingType.Name.lower() if type_rel.RelatingType.Name else ""
-                except:
-                    pass
-            
+            width = next((estimate for keywords, estimate in WINDOW_WIDTH_ESTIMATES
+                          if window_type_name and any(k in window_type_name for k in keywords)),
+                         DEFAULT_WINDOW_WIDTH)
+        
+        if height is None or height <= 0:
             # Estimate height based on window type
-            if 'tall' in window_type_name or 'high' in window_type_name:
-                height = 2.0
-            elif 'short' in window_type_name or 'low' in window_type_name:
-                height = 0.8
-            else:
-                height = 1.2  # Standard window height
+            height = next((estimate for keywords, estimate in WINDOW_HEIGHT_ESTIMATES
+                           if window_type_name and any(k in window_type_name for k in keywords)),
+                          DEFAULT_WINDOW_HEIGHT)
         
         width = float(width)
         height = float(height)
@@ -1575,8 +1877,8 @@ class IFCImporter(BaseImporter):
         """
         # Try to get from ObjectPlacement (handles relative placements)
         try:
-            if hasattr(window_elem, 'ObjectPlacement') and window_elem.ObjectPlacement:
-                placement = window_elem.ObjectPlacement
+            placement = getattr(window_elem, 'ObjectPlacement', None)
+            if placement:
                 coords = self._get_absolute_coordinates(placement)
                 if coords:
                     return coords
@@ -1601,6 +1903,52 @@ class IFCImporter(BaseImporter):
     def _get_absolute_coordinates(self, placement) -> Optional[Tuple[float, float, float]]:
         """
         Get absolute coordinates from IFC placement, handling relative placements.
+        Walks the PlacementRelTo chain iteratively, stopping at the first placement
+        already resolved for this file (many elements share the same parent placements),
+        and caches every placement on the way, including failures (None).
+        
+        Args:
+            placement: IFC ObjectPlacement element
+            
+        Returns:
+            Tuple of (x, y, z) coordinates or None if extraction fails
+        """
+        cache = self._placement_coord_cache
+        chain = []  # (placement id, own location or None), child first
+        parent_coords = None
+        node = placement
+        while node is not None:
+            node_id = node.id()
+            if node_id in cache:
+                parent_coords = cache[node_id]
+                break
+            if any(node_id == chain_id for chain_id, _ in chain):
+                logger.debug(f"Cyclic placement chain at #{node_id}, treating it as the root")
+                break
+            location = self._placement_location(node)
+            chain.append((node_id, location))
+            if location is None:
+                # Unresolvable placement: its parents cannot affect the result
+                break
+            node = getattr(node, 'PlacementRelTo', None)
+        
+        # Resolve from the outermost placement down to the requested one
+        # (simplified - adds parent offsets, should use transformation matrix)
+        for node_id, location in reversed(chain):
+            if location is not None and parent_coords:
+                parent_coords = (
+                    location[0] + parent_coords[0],
+                    location[1] + parent_coords[1],
+                    location[2] + parent_coords[2]
+                )
+            else:
+                parent_coords = location
+            cache[node_id] = parent_coords
+        return parent_coords
+    
+    def _placement_location(self, placement) -> Optional[Tuple[float, float, float]]:
+        """
+        Get the location of an IFC placement relative to its parent placement.
         
         Args:
             placement: IFC ObjectPlacement element
@@ -1611,33 +1959,16 @@ class IFCImporter(BaseImporter):
         try:
             # Handle IfcLocalPlacement (relative placement)
             if placement.is_a("IfcLocalPlacement"):
-                if hasattr(placement, 'RelativePlacement') and placement.RelativePlacement:
-                    rel_placement = placement.RelativePlacement
-                    if hasattr(rel_placement, 'Location') and rel_placement.Location:
-                        location = rel_placement.Location
-                        if hasattr(location, 'Coordinates'):
-                            coords = location.Coordinates
-                            if len(coords) >= 3:
-                                base_coords = [float(coords[0]), float(coords[1]), float(coords[2])]
-                                
-                                # If placement is relative to parent, need to transform
-                                if hasattr(placement, 'PlacementRelTo') and placement.PlacementRelTo:
-                                    parent_coords = self._get_absolute_coordinates(placement.PlacementRelTo)
-                                    if parent_coords:
-                                        # Add parent coordinates (simplified - should use transformation matrix)
-                                        return (
-                                            base_coords[0] + parent_coords[0],
-                                            base_coords[1] + parent_coords[1],
-                                            base_coords[2] + parent_coords[2]
-                                        )
-                                
-                                return tuple(base_coords)
+                rel_placement = getattr(placement, 'RelativePlacement', None)
+                location = getattr(rel_placement, 'Location', None) if rel_placement else None
+                coords = getattr(location, 'Coordinates', None) if location else None
+                if coords is not None and len(coords) >= 3:
+                    return (float(coords[0]), float(coords[1]), float(coords[2]))
             
             # Handle IfcGridPlacement (grid-based placement)
             elif placement.is_a("IfcGridPlacement"):
                 # Grid placements are more complex - would need grid definition
                 logger.debug("IfcGridPlacement not fully supported, using default position")
-                return None
                 
         except Exception as e:
             logger.debug(f"Error getting absolute coordinates: {e}")
@@ -1654,26 +1985,18 @@ class IFCImporter(BaseImporter):
         # Method 1: Try to extract from geometry transformation matrix (most accurate)
         if not self.lightweight:
             try:
-                settings = geom.settings()
-                shape = geom.create_shape(settings, window_elem)
+                shape = geom.create_shape(_geometry_settings(), window_elem)
                 if hasattr(shape, 'transformation') and shape.transformation:
-                    matrix = shape.transformation.matrix.data
+                    matrix = np.asarray(shape.transformation.matrix.data, dtype=np.float64)
                     if len(matrix) >= 16:
                         # IFC transformation matrix is 4x4 stored as 16-element array
                         # Column 0-3: X-axis (right direction)
                         # Column 4-7: Y-axis (window normal - direction window faces) ← THIS IS WHAT WE NEED
                         # Column 8-11: Z-axis (up direction)
                         # Column 12-15: Translation (position)
-                        # Extract Y-axis (columns 4, 5, 6) as the window normal
-                        normal = (
-                            float(matrix[4]),
-                            float(matrix[5]),
-                            float(matrix[6])
-                        )
-                        # Normalize
-                        norm_length = (normal[0]**2 + normal[1]**2 + normal[2]**2)**0.5
-                        if norm_length > 1e-6:
-                            normal = (normal[0]/norm_length, normal[1]/norm_length, normal[2]/norm_length)
+                        # Extract Y-axis (columns 4, 5, 6) as the window normal (normalized)
+                        normal = _unit_axis(matrix, 4)
+                        if normal is not None:
                             logger.debug(f"Extracted window normal from transformation matrix Y-axis: {normal}")
                             return normal
             except Exception as e:
@@ -1681,37 +2004,28 @@ class IFCImporter(BaseImporter):
         
         # Method 2: Try to get from ObjectPlacement rotation (IfcAxis2Placement3D)
         try:
-            if hasattr(window_elem, 'ObjectPlacement') and window_elem.ObjectPlacement:
-                placement = window_elem.ObjectPlacement
-                if hasattr(placement, 'RelativePlacement') and placement.RelativePlacement:
-                    rel_placement = placement.RelativePlacement
-                    # IfcAxis2Placement3D has RefDirection (X-axis) and Axis (Z-axis)
-                    # The Y-axis (window normal) is perpendicular to both
-                    if hasattr(rel_placement, 'RefDirection') and rel_placement.RefDirection:
-                        ref_dir = rel_placement.RefDirection
-                        if hasattr(ref_dir, 'DirectionRatios'):
-                            x_axis = ref_dir.DirectionRatios
-                            if len(x_axis) >= 3:
-                                x_axis = np.array([float(x_axis[0]), float(x_axis[1]), float(x_axis[2])])
-                                
-                                # Get Z-axis (up direction)
-                                z_axis = None
-                                if hasattr(rel_placement, 'Axis') and rel_placement.Axis:
-                                    axis = rel_placement.Axis
-                                    if hasattr(axis, 'DirectionRatios'):
-                                        z_ratios = axis.DirectionRatios
-                                        if len(z_ratios) >= 3:
-                                            z_axis = np.array([float(z_ratios[0]), float(z_ratios[1]), float(z_ratios[2])])
-                                
-                                # Calculate Y-axis (window normal) = Z × X (cross product)
-                                if z_axis is not None:
-                                    y_axis = np.cross(z_axis, x_axis)
-                                    norm = np.linalg.norm(y_axis)
-                                    if norm > 1e-6:
-                                        y_axis = y_axis / norm
-                                        normal = tuple(y_axis)
-                                        logger.debug(f"Extracted window normal from placement axes: {normal}")
-                                        return normal
+            placement = getattr(window_elem, 'ObjectPlacement', None)
+            rel_placement = getattr(placement, 'RelativePlacement', None) if placement else None
+            # IfcAxis2Placement3D has RefDirection (X-axis) and Axis (Z-axis)
+            # The Y-axis (window normal) is perpendicular to both
+            ref_dir = getattr(rel_placement, 'RefDirection', None) if rel_placement else None
+            axis = getattr(rel_placement, 'Axis', None) if rel_placement else None
+            x_ratios = getattr(ref_dir, 'DirectionRatios', None) if ref_dir else None
+            z_ratios = getattr(axis, 'DirectionRatios', None) if axis else None
+            if x_ratios and z_ratios and len(x_ratios) >= 3 and len(z_ratios) >= 3:
+                xx, xy, xz = (float(v) for v in x_ratios[:3])
+                zx, zy, zz = (float(v) for v in z_ratios[:3])
+                
+                # Calculate Y-axis (window normal) = Z × X (cross product, written out for 3 components)
+                yx = zy * xz - zz * xy
+                yy = zz * xx - zx * xz
+                yz = zx * xy - zy * xx
+                norm_squared = yx * yx + yy * yy + yz * yz
+                if norm_squared > 1e-12:
+                    inv_norm = 1.0 / math.sqrt(norm_squared)
+                    normal = (yx * inv_norm, yy * inv_norm, yz * inv_norm)
+                    logger.debug(f"Extracted window normal from placement axes: {normal}")
+                    return normal
         except Exception as e:
             logger.debug(f"Error extracting window normal from placement: {e}")
         
@@ -1744,8 +2058,8 @@ class IFCImporter(BaseImporter):
             return None
         
         try:
-            # Open IFC file
-            ifc_file = ifcopenshell.open(ifc_file_path)
+            # Open IFC file (reused across calls until the file changes on disk)
+            ifc_file = _open_ifc_cached(ifc_file_path, os.path.getmtime(ifc_file_path))
             
             # Get element by ID
             try:
@@ -1759,149 +2073,148 @@ class IFCImporter(BaseImporter):
                 logger.warning(f"Element {element_id} not found in IFC file")
                 return None
             
-            # Extract geometry using ifcopenshell
-            # CRITICAL: Use the SAME settings as main mesh generation to ensure coordinate system consistency
-            settings = geom.settings()
-            try:
-                # Enable world coordinates (same as main mesh generation)
-                if hasattr(settings, 'USE_WORLD_COORDS'):
-                    settings.set(settings.USE_WORLD_COORDS, True)
-                    logger.debug(f"Enabled world coordinates for element {element_id}")
-            except Exception as e:
-                logger.debug(f"Could not enable world coordinates: {e}")
-            
-            # Use the same additional settings as main mesh generation for consistency
-            try:
-                if hasattr(settings, 'USE_BREP_DATA'):
-                    settings.set(settings.USE_BREP_DATA, True)
-                if hasattr(settings, 'USE_PYTHON_OPENCASCADE'):
-                    settings.set(settings.USE_PYTHON_OPENCASCADE, False)
-                if hasattr(settings, 'SEW_SHELLS'):
-                    settings.set(settings.SEW_SHELLS, True)
-                if hasattr(settings, 'DISABLE_OPENING_SUBTRACTION'):
-                    settings.set(settings.DISABLE_OPENING_SUBTRACTION, False)
-                if hasattr(settings, 'USE_MATERIAL_COLOR'):
-                    settings.set(settings.USE_MATERIAL_COLOR, True)
-                if hasattr(settings, 'WELD_VERTICES'):
-                    settings.set(settings.WELD_VERTICES, False)
-            except Exception as e:
-                logger.debug(f"Some geometry settings could not be configured: {e}")
+            # Extract geometry using ifcopenshell (same settings as main mesh generation)
+            settings = _element_mesh_settings()
             
             try:
                 shape = geom.create_shape(settings, element)
-                geometry = shape.geometry
             except Exception as e:
                 logger.debug(f"Could not create shape for element {element_id}: {e}")
                 return None
             
-            # Extract vertices and faces
-            vertices = None
-            faces = None
-            
-            # Method 1: Use tessellation
-            try:
-                if hasattr(geometry, 'tessellation'):
-                    tess = geometry.tessellation()
-                    if tess and isinstance(tess, tuple) and len(tess) >= 2:
-                        vertices = np.array(tess[0], dtype=np.float64)
-                        faces_data = tess[1]
-                        faces = np.array(faces_data, dtype=np.int32)
-                        if len(faces.shape) == 1 and len(faces) % 3 == 0:
-                            faces = faces.reshape(-1, 3)
-            except Exception as e:
-                logger.debug(f"Tessellation failed for element {element_id}: {e}")
+            return IFCImporter._shape_to_trimesh(shape, element_id)
+                
+        except Exception as e:
+            logger.warning(f"Error extracting mesh for element {element_id} from {ifc_file_path}: {e}")
+            return None
+    
+    @staticmethod
+    def _shape_to_trimesh(shape, element_id) -> Optional['trimesh.Trimesh']:
+        """
+        Build a trimesh from a shape produced by ifcopenshell.geom (create_shape or iterator).
+        
+        Args:
+            shape: Shape with .geometry and optional .transformation
+            element_id: IFC element ID (for logging)
             
-            # Method 2: Direct access to verts/faces
-            if (vertices is None or faces is None) and hasattr(geometry, 'verts') and hasattr(geometry, 'faces'):
-                try:
-                    verts = geometry.verts
-                    faces_data = geometry.faces
-                    vertices = np.array(verts, dtype=np.float64)
+        Returns:
+            trimesh.Trimesh object with element geometry, or None if the shape has no valid geometry
+        """
+        geometry = shape.geometry
+        
+        # Extract vertices and faces
+        vertices = None
+        faces = None
+        
+        # Method 1: Use tessellation
+        try:
+            if hasattr(geometry, 'tessellation'):
+                tess = geometry.tessellation()
+                if tess and isinstance(tess, tuple) and len(tess) >= 2:
+                    vertices = _as_flat_array(tess[0], np.float64)
                     if len(vertices.shape) == 1 and len(vertices) % 3 == 0:
                         vertices = vertices.reshape(-1, 3)
-                    faces = np.array(faces_data, dtype=np.int32)
+                    faces_data = tess[1]
+                    faces = _as_flat_array(faces_data, np.int32)
                     if len(faces.shape) == 1 and len(faces) % 3 == 0:
                         faces = faces.reshape(-1, 3)
-                except Exception as e:
-                    logger.debug(f"Direct verts/faces access failed for element {element_id}: {e}")
-            
-            # CRITICAL: Apply transformation matrix if available and not identity
-            # Even with USE_WORLD_COORDS, some ifcopenshell versions may not apply transformations correctly
-            # Check if transformation is non-identity before applying
-            if vertices is not None and hasattr(shape, 'transformation') and shape.transformation:
-                try:
-                    matrix = shape.transformation.matrix.data
-                    if len(matrix) >= 16:
-                        # Check if transformation matrix is identity (no transformation needed)
-                        identity = np.array([
-                            [1, 0, 0, 0],
-                            [0, 1, 0, 0],
-                            [0, 0, 1, 0],
-                            [0, 0, 0, 1]
-                        ])
-                        transform_matrix = np.array([
-                            [matrix[0], matrix[1], matrix[2], matrix[3]],
-                            [matrix[4], matrix[5], matrix[6], matrix[7]],
-                            [matrix[8], matrix[9], matrix[10], matrix[11]],
-                            [matrix[12], matrix[13], matrix[14], matrix[15]]
-                        ])
-                        
-                        # Check if matrix is significantly different from identity
-                        if not np.allclose(transform_matrix, identity, atol=1e-6):
-                            # Apply transformation to all vertices
-                            # Add homogeneous coordinate (w=1) to vertices
-                            vertices_homogeneous = np.hstack([vertices, np.ones((len(vertices), 1))])
-                            # Transform: v' = M * v
-                            vertices_transformed = (transform_matrix @ vertices_homogeneous.T).T
-                            # Extract x, y, z (drop w coordinate)
-                            vertices = vertices_transformed[:, :3]
-                            logger.debug(f"Applied transformation matrix to {len(vertices)} vertices for element {element_id}")
-                        else:
-                            logger.debug(f"Transformation matrix is identity for element {element_id} - no transformation needed")
-                except Exception as e:
-                    logger.debug(f"Could not apply transformation matrix for element {element_id}: {e}")
-                    # Continue without transformation - USE_WORLD_COORDS might have already applied it
-            
-            # Create mesh if we have valid data
-            if vertices is not None and faces is not None and len(vertices) > 0 and len(faces) > 0:
-                try:
-                    # Validate face indices
-                    max_vertex_idx = np.max(faces)
-                    if max_vertex_idx >= len(vertices):
-                        # Filter out invalid faces
-                        valid_faces = []
-                        for face in faces:
-                            if all(0 <= idx < len(vertices) for idx in face):
-                                valid_faces.append(face)
-                        if len(valid_faces) > 0:
-                            faces = np.array(valid_faces, dtype=np.int32)
-                        else:
-                            logger.warning(f"All faces invalid for element {element_id}")
-                            return None
-                    
-                    mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
-                    
-                    # Validate mesh
-                    if len(mesh.vertices) > 0 and len(mesh.faces) > 0:
-                        logger.info(f"✓ Extracted mesh for element {element_id}: {len(mesh.vertices)} vertices, {len(mesh.faces)} faces")
-                        # Log mesh bounds for debugging
-                        bounds = mesh.bounds
-                        logger.debug(f"Mesh bounds: min={bounds[0]}, max={bounds[1]}")
-                        return mesh
+        except Exception as e:
+            logger.debug(f"Tessellation failed for element {element_id}: {e}")
+        
+        # Method 2: Direct access to verts/faces
+        if (vertices is None or faces is None) and hasattr(geometry, 'verts') and hasattr(geometry, 'faces'):
+            try:
+                verts = geometry.verts
+                faces_data = geometry.faces
+                vertices = _as_flat_array(verts, np.float64)
+                if len(vertices.shape) == 1 and len(vertices) % 3 == 0:
+                    vertices = vertices.reshape(-1, 3)
+                faces = _as_flat_array(faces_data, np.int32)
+                if len(faces.shape) == 1 and len(faces) % 3 == 0:
+                    faces = faces.reshape(-1, 3)
+            except Exception as e:
+                logger.debug(f"Direct verts/faces access failed for element {element_id}: {e}")
+        
+        # CRITICAL: Apply transformation matrix if available and not identity
+        # Even with USE_WORLD_COORDS, some ifcopenshell versions may not apply transformations correctly
+        # Check if transformation is non-identity before applying
+        if vertices is not None and hasattr(shape, 'transformation') and shape.transformation:
+            try:
+                matrix = shape.transformation.matrix.data
+                if len(matrix) >= 16:
+                    # Check if matrix is significantly different from identity (no transformation needed);
+                    # only the first 3 rows matter, the last row of an affine transform is always 0, 0, 0, 1
+                    if not all(abs(value - expected) <= IDENTITY_TOLERANCE for value, expected in zip(matrix, AFFINE_IDENTITY)):
+                        transform_matrix = np.asarray(matrix, dtype=np.float64)[:16].reshape(4, 4)
+                        # Apply transformation to all vertices: v' = M * (x, y, z, 1), keeping x, y, z
+                        vertices = apply_affine(np.ascontiguousarray(vertices, dtype=np.float64), transform_matrix)
+                        logger.debug(f"Applied transformation matrix to {len(vertices)} vertices for element {element_id}")
                     else:
-                        logger.warning(f"Created mesh is empty for element {element_id}")
+                        logger.debug(f"Transformation matrix is identity for element {element_id} - no transformation needed")
+            except Exception as e:
+                logger.debug(f"Could not apply transformation matrix for element {element_id}: {e}")
+                # Continue without transformation - USE_WORLD_COORDS might have already applied it
+        
+        # Create mesh if we have valid data
+        if vertices is not None and faces is not None and len(vertices) > 0 and len(faces) > 0:
+            try:
+                # Validate face indices
+                max_vertex_idx = np.max(faces)
+                if max_vertex_idx >= len(vertices):
+                    # Filter out invalid faces
+                    num_vertices = len(vertices)
+                    valid_mask = ((faces >= 0) & (faces < num_vertices)).all(axis=1)
+                    if not valid_mask.any():
+                        logger.warning(f"All faces invalid for element {element_id}")
                         return None
-                except Exception as e:
-                    logger.error(f"Failed to create mesh for element {element_id}: {e}", exc_info=True)
+                    faces = np.ascontiguousarray(faces[valid_mask], dtype=np.int32)
+                
+                mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
+                
+                # Validate mesh
+                if len(mesh.vertices) > 0 and len(mesh.faces) > 0:
+                    logger.info(f"✓ Extracted mesh for element {element_id}: {len(mesh.vertices)} vertices, {len(mesh.faces)} faces")
+                    # Log mesh bounds for debugging
+                    bounds = mesh.bounds
+                    logger.debug(f"Mesh bounds: min={bounds[0]}, max={bounds[1]}")
+                    return mesh
+                else:
+                    logger.warning(f"Created mesh is empty for element {element_id}")
                     return None
-            else:
-                logger.warning(f"Could not extract valid geometry for element {element_id}: vertices={vertices is not None and len(vertices) if vertices is not None else None}, faces={faces is not None and len(faces) if faces is not None else None}")
+            except Exception as e:
+                logger.error(f"Failed to create mesh for element {element_id}: {e}", exc_info=True)
                 return None
-                
-        except Exception as e:
-            logger.warning(f"Error extracting mesh for element {element_id} from {ifc_file_path}: {e}")
+        else:
+            logger.warning(f"Could not extract valid geometry for element {element_id}: vertices={vertices is not None and len(vertices) if vertices is not None else None}, faces={faces is not None and len(faces) if faces is not None else None}")
             return None
     
+    @staticmethod
+    def _shape_has_geometry(shape) -> bool:
+        """
+        Check whether a shape from ifcopenshell.geom.create_shape has vertices and faces.
+        
+        Args:
+            shape: Shape returned by create_shape (may be None)
+            
+        Returns:
+            True if the shape's geometry has at least one vertex and one face
+        """
+        geometry = getattr(shape, 'geometry', None) if shape else None
+        if not geometry:
+            return False
+        
+        # Check for vertices/faces
+        if hasattr(geometry, 'verts') and hasattr(geometry, 'faces'):
+            return len(geometry.verts) > 0 and len(geometry.faces) > 0
+        if hasattr(geometry, 'tessellation'):
+            try:
+                tess = geometry.tessellation()
+                if tess and isinstance(tess, tuple) and len(tess) >= 2:
+                    return len(tess[0]) > 0 and len(tess[1]) > 0
+            except Exception:
+                pass
+        return False
+    
     def _extract_geometry_from_ifc(self, element) -> Tuple[Tuple[float, float, float], Tuple[float, float, float], Tuple[float, float]]:
         """
         Extract geometry from IFC element using ifcopenshell.geom.
@@ -1909,14 +2222,7 @@ class IFCImporter(BaseImporter):
         Handles coordinate transformations properly.
         """
         try:
-            settings = geom.settings()
-            # Use world coordinates (if available in this version)
-            try:
-                if hasattr(settings, 'USE_WORLD_COORDS'):
-                    settings.set(settings.USE_WORLD_COORDS, True)
-            except:
-                pass  # Some versions don't have this setting
-            shape = geom.create_shape(settings, element)
+            shape = geom.create_shape(_geometry_settings(use_world_coords=True), element)
             geometry = shape.geometry
             
             # Get bounding box - Triangulation objects don't have bbox attribute
@@ -1950,25 +2256,26 @@ class IFCImporter(BaseImporter):
                         raise ValueError("Not enough vertices")
                     
                     # Calculate bounding box
-                    min_bounds = np.min(vertices, axis=0)
-                    max_bounds = np.max(vertices, axis=0)
-                    min_bounds = tuple(min_bounds)
-                    max_bounds = tuple(max_bounds)
+                    min_bounds = tuple(vertices.min(axis=0))
+                    max_bounds = tuple(vertices.max(axis=0))
                 except Exception as e:
                     logger.debug(f"Error processing vertices for bbox: {e}")
-                    # Fallback: manual calculation
-                    if isinstance(verts, (list, tuple)) and len(verts) >= 3:
-                        x_coords = [v[0] if isinstance(v, (list, tuple, np.ndarray)) and len(v) > 0 else (verts[i] if i < len(verts) else 0) for i, v in enumerate(verts[::3])]
-                        y_coords = [v[1] if isinstance(v, (list, tuple, np.ndarray)) and len(v) > 1 else (verts[i+1] if i+1 < len(verts) else 0) for i, v in enumerate(verts[1::3])]
-                        z_coords = [v[2] if isinstance(v, (list, tuple, np.ndarray)) and len(v) > 2 else (verts[i+2] if i+2 < len(verts) else 0) for i, v in enumerate(verts[2::3])]
-                        
-                        if x_coords and y_coords and z_coords:
-                            min_bounds = (min(x_coords), min(y_coords), min(z_coords))
-                            max_bounds = (max(x_coords), max(y_coords), max(z_coords))
-                        else:
-                            raise ValueError("Could not extract coordinates from vertices")
+                    # Fallback: tolerate a trailing partial vertex in flat input and extra columns
+                    # (e.g. homogeneous (N, 4)) in 2D input; anything else is rejected
+                    if not isinstance(verts, (list, tuple)) or len(verts) < 3:
+                        raise ValueError("Invalid vertex format")
+                    coords = np.asarray(verts, dtype=np.float64)
+                    if coords.ndim == 1:
+                        # Flat x, y, z list
+                        coords = coords[:len(coords) - len(coords) % 3].reshape(-1, 3)
+                    elif coords.ndim == 2 and coords.shape[1] >= 3:
+                        coords = coords[:, :3]
                     else:
                         raise ValueError("Invalid vertex format")
+                    if len(coords) < 3:
+                        raise ValueError("Not enough vertices")
+                    min_bounds = tuple(coords.min(axis=0))
+                    max_bounds = tuple(coords.max(axis=0))
             else:
                 raise ValueError("Geometry has no bbox or verts attribute")
             
@@ -1995,36 +2302,25 @@ class IFCImporter(BaseImporter):
             normal = (0.0, 1.0, 0.0)  # Default facing north
             try:
                 if hasattr(shape, 'transformation') and shape.transformation:
-                    matrix = shape.transformation.matrix.data
+                    matrix = np.asarray(shape.transformation.matrix.data, dtype=np.float64)
                     if len(matrix) >= 16:
                         # IFC transformation matrix is 4x4 stored as 16-element array
                         # Column 0-3: X-axis (right direction)
                         # Column 4-7: Y-axis (window normal - direction window faces) ← THIS IS WHAT WE NEED
                         # Column 8-11: Z-axis (up direction)
                         # Column 12-15: Translation (position)
-                        # Extract Y-axis (columns 4, 5, 6) as the window normal
-                        normal = (
-                            float(matrix[4]),
-                            float(matrix[5]),
-                            float(matrix[6])
-                        )
-                        # Normalize
-                        norm_length = (normal[0]**2 + normal[1]**2 + normal[2]**2)**0.5
-                        if norm_length > 1e-6:
-                            normal = (normal[0]/norm_length, normal[1]/norm_length, normal[2]/norm_length)
+                        # Extract Y-axis (columns 4, 5, 6) as the window normal (normalized)
+                        axis = _unit_axis(matrix, 4)
+                        if axis is not None:
+                            normal = axis
                             logger.debug(f"Extracted window normal from transformation matrix Y-axis: {normal}")
                         else:
                             logger.debug("Normal vector has zero length, using default")
                     elif len(matrix) >= 12:
                         # Fallback for older matrix format - try Z-axis
-                        normal = (
-                            float(matrix[8]),
-                            float(matrix[9]),
-                            float(matrix[10])
-                        )
-                        norm_length = (normal[0]**2 + normal[1]**2 + normal[2]**2)**0.5
-                        if norm_length > 1e-6:
-                            normal = (normal[0]/norm_length, normal[1]/norm_length, normal[2]/norm_length)
+                        axis = _unit_axis(matrix, 8)
+                        if axis is not None:
+                            normal = axis
                             logger.debug(f"Extracted window normal from transformation matrix Z-axis (fallback): {normal}")
             except Exception as e:
                 logger.debug(f"Could not extract normal from transformation: {e}")
@@ -2047,7 +2343,7 @@ class IFCImporter(BaseImporter):
         Uses properties first (fast), falls back to geometry if needed.
         """
         if properties is None:
-            properties = self._extract_properties(space_elem)
+            properties = self._extract_properties_cached(space_elem)
         
         # Try to extract from properties
         depth = properties.get('Depth', properties.get('Length', None))
@@ -2061,8 +2357,7 @@ class IFCImporter(BaseImporter):
         # Fallback: extract from geometry (lightweight - just bounding box)
         if not self.lightweight:
             try:
-                settings = geom.settings()
-                shape = geom.create_shape(settings, space_elem)
+                shape = geom.create_shape(_geometry_settings(), space_elem)
                 geometry = shape.geometry
                 
                 # Get bounding box - handle Triangulation objects
@@ -2121,32 +2416,29 @@ class IFCImporter(BaseImporter):
         """
         try:
             # Method 1: Check IfcRelContainedInSpatialStructure relationship
-            contained_rels = self.ifc_file.by_type("IfcRelContainedInSpatialStructure")
-            for rel in contained_rels:
-                if space_elem in rel.RelatedElements:
-                    container = rel.RelatingStructure
-                    if container and container.is_a("IfcBuildingStorey"):
-                        # Extract floor number from storey name or elevation
-                        storey_name = container.Name if hasattr(container, 'Name') else ""
-                        # Try to parse floor number from name (e.g., "Level 1", "Floor 2")
-                        import re
-                        match = re.search(r'(\d+)', storey_name)
-                        if match:
-                            return int(match.group(1))
-                        
-                        # Try elevation
-                        if hasattr(container, 'Elevation'):
-                            elevation = container.Elevation
-                            # Assume 3m per floor
-                            floor_number = max(1, int(elevation / 3.0) + 1)
-                            return floor_number
+            _, structure_by_element = self._get_spatial_index()
+            container = structure_by_element.get(space_elem.id())
+            if container and container.is_a("IfcBuildingStorey"):
+                # Extract floor number from storey name or elevation
+                storey_name = getattr(container, 'Name', None) or ""
+                # Try to parse floor number from name (e.g., "Level 1", "Floor 2")
+                match = re.search(r'(\d+)', storey_name)
+                if match:
+                    return int(match.group(1))
+                
+                # Try elevation
+                elevation = getattr(container, 'Elevation', None)
+                if elevation is not None:
+                    # Assume 3m per floor
+                    floor_number = max(1, int(elevation / 3.0) + 1)
+                    return floor_number
         except Exception as e:
             logger.debug(f"Error extracting floor number from relationships: {e}")
         
         # Method 2: Extract from space elevation
         try:
-            if hasattr(space_elem, 'ElevationOfRefHeight'):
-                elevation = space_elem.ElevationOfRefHeight
+            elevation = getattr(space_elem, 'ElevationOfRefHeight', None)
+            if elevation is not None:
                 # Assume 3m per floor
                 floor_number = max(1, int(elevation / 3.0) + 1)
                 return floor_number
@@ -2162,6 +2454,24 @@ class IFCImporter(BaseImporter):
         # Simplified - would need more complex logic
         return None
     
+    def _extract_material_properties_cached(self, element) -> Dict:
+        """
+        Extract material properties from IFC element, walking its material
+        associations only once per element.
+        
+        Args:
+            element: IFC element
+        
+        Returns:
+            Dictionary with material properties (a copy callers may modify)
+        """
+        element_id = element.id()
+        material_props = self._material_cache.get(element_id)
+        if material_props is None:
+            material_props = self._extract_material_properties(element)
+            self._material_cache[element_id] = material_props
+        return dict(material_props)
+    
     def _extract_material_properties(self, element) -> Dict:
         """
         Extract material properties from IFC element comprehensively.
@@ -2180,56 +2490,53 @@ class IFCImporter(BaseImporter):
         
         try:
             # Method 1: Get material association directly from element
-            if hasattr(element, 'HasAssociations'):
-                for assoc in element.HasAssociations:
-                    if assoc.is_a("IfcRelAssociatesMaterial"):
-                        material_select = assoc.RelatingMaterial
-                        material_info = self._extract_single_material(material_select)
-                        if material_info:
-                            all_materials.append(material_info)
-                            # Use first material as primary
-                            if not material_props:
-                                material_props = material_info
+            associations = getattr(element, 'HasAssociations', None) or ()
+            for assoc in associations:
+                if assoc.is_a("IfcRelAssociatesMaterial"):
+                    material_select = assoc.RelatingMaterial
+                    material_info = self._extract_single_material(material_select)
+                    if material_info:
+                        all_materials.append(material_info)
+                        # Use first material as primary
+                        if not material_props:
+                            material_props = material_info
             
             # Method 2: For windows, check window type for materials
             if element.is_a("IfcWindow") and not material_props:
-                if hasattr(element, 'IsTypedBy') and element.IsTypedBy:
-                    for type_rel in element.IsTypedBy:
-                        if hasattr(type_rel, 'RelatingType') and type_rel.RelatingType:
-                            window_type = type_rel.RelatingType
-                            # Extract materials from window type
-                            if hasattr(window_type, 'HasAssociations'):
-                                for assoc in window_type.HasAssociations:
-                                    if assoc.is_a("IfcRelAssociatesMaterial"):
-                                        material_select = assoc.RelatingMaterial
-                                        material_info = self._extract_single_material(material_select)
-                                        if material_info:
-                                            all_materials.append(material_info)
-                                            if not material_props:
-                                                material_props = material_info
-                                                logger.debug(f"Found material for window {element.id()} via window type")
+                for type_rel in getattr(element, 'IsTypedBy', None) or ():
+                    window_type = getattr(type_rel, 'RelatingType', None)
+                    if window_type:
+                        # Extract materials from window type
+                        for assoc in getattr(window_type, 'HasAssociations', None) or ():
+                            if assoc.is_a("IfcRelAssociatesMaterial"):
+                                material_select = assoc.RelatingMaterial
+                                material_info = self._extract_single_material(material_select)
+                                if material_info:
+                                    all_materials.append(material_info)
+                                    if not material_props:
+                                        material_props = material_info
+                                        logger.debug(f"Found material for window {element.id()} via window type")
             
             # Method 3: Check for material constituent sets (different materials for different parts)
             # This is CRITICAL for windows - they often have frame + glazing materials
-            if hasattr(element, 'HasAssociations'):
-                for assoc in element.HasAssociations:
-                    if assoc.is_a("IfcRelAssociatesMaterial"):
-                        material_select = assoc.RelatingMaterial
-                        if material_select.is_a("IfcMaterialConstituentSet"):
-                            # Use deep extraction method which handles constituents properly
-                            constituent_info = self._extract_single_material(material_select)
-                            if constituent_info:
-                                # Merge into material_props
-                                if 'constituents' in constituent_info:
-                                    material_props['constituents'] = constituent_info['constituents']
-                                if 'has_glazing' in constituent_info:
-                                    material_props['has_glazing'] = constituent_info['has_glazing']
-                                if 'is_window_material' in constituent_info:
-                                    material_props['is_window_material'] = constituent_info['is_window_material']
-                                material_props['type'] = 'IfcMaterialConstituentSet'
-                                logger.debug(f"Found material constituent set for element {element.id()}")
-                                if material_props.get('has_glazing'):
-                                    logger.info(f"Element {element.id()} has glazing material - likely a window")
+            for assoc in associations:
+                if assoc.is_a("IfcRelAssociatesMaterial"):
+                    material_select = assoc.RelatingMaterial
+                    if material_select.is_a("IfcMaterialConstituentSet"):
+                        # Use deep extraction method which handles constituents properly
+                        constituent_info = self._extract_single_material(material_select)
+                        if constituent_info:
+                            # Merge into material_props
+                            if 'constituents' in constituent_info:
+                                material_props['constituents'] = constituent_info['constituents']
+                            if 'has_glazing' in constituent_info:
+                                material_props['has_glazing'] = constituent_info['has_glazing']
+                            if 'is_window_material' in constituent_info:
+                                material_props['is_window_material'] = constituent_info['is_window_material']
+                            material_props['type'] = 'IfcMaterialConstituentSet'
+                            logger.debug(f"Found material constituent set for element {element.id()}")
+                            if material_props.get('has_glazing'):
+                                logger.info(f"Element {element.id()} has glazing material - likely a window")
             
             # Store all materials if multiple found
             if len(all_materials) > 1:
@@ -2363,8 +2670,7 @@ class IFCImporter(BaseImporter):
                                                 layer_info['properties'][prop_name] = prop_value
                         
                         # Check if layer is glazing (critical for window detection)
-                        mat_name = layer_info.get('name', '').lower() if layer_info.get('name') else ''
-                        if any(keyword in mat_name for keyword in ['glass', 'glazing', 'verre', 'стекло', 'vitrage', 'pane']):
+                        if GLAZING_KEYWORDS_RE.search(layer_info.get('name') or ''):
                             layer_info['is_glazing'] = True
                             material_props['has_glazing'] = True
                             material_props['is_window_material'] = True
@@ -2409,6 +2715,24 @@ class IFCImporter(BaseImporter):
         
         return material_props
     
+    def _extract_color_and_style_cached(self, element) -> Dict:
+        """
+        Extract color and style information from IFC element, resolving it only
+        once per element (window types, walls and openings are shared by many windows).
+        
+        Args:
+            element: IFC element
+        
+        Returns:
+            Dictionary with color/style information (a copy callers may modify)
+        """
+        element_id = element.id()
+        style_info = self._color_style_cache.get(element_id)
+        if style_info is None:
+            style_info = self._extract_color_and_style(element)
+            self._color_style_cache[element_id] = style_info
+        return dict(style_info)
+    
     def _extract_color_and_style(self, element) -> Dict:
         """
         Extract color and style information from IFC element.
@@ -2444,37 +2768,10 @@ class IFCImporter(BaseImporter):
             # This is the standard way IFC stores style information
             if hasattr(element, 'Representation') and element.Representation:
                 for representation in element.Representation.Representations:
-                    if hasattr(representation, 'Items'):
-                        for item in representation.Items:
-                            # Check for IfcStyledItem (newer IFC versions use this)
-                            if hasattr(item, 'StyledByItem') and item.StyledByItem:
-                                for styled_item in item.StyledByItem:
-                                    if hasattr(styled_item, 'Styles') and styled_item.Styles:
-                                        for style_assignment in styled_item.Styles:
-                                            color = self._extract_color_from_style(style_assignment)
-                                            if color:
-                                                style_info.update(color)
-                                                logger.debug(f"Found color via IfcStyledItem for element {element.id()}")
-                                                break
-                                    if style_info:
-                                        break
-                            
-                            # Check for HasStyledItem (alternative relationship name)
-                            if not style_info and hasattr(item, 'HasStyledItem') and item.HasStyledItem:
-                                for styled_item in item.HasStyledItem:
-                                    if hasattr(styled_item, 'Styles') and styled_item.Styles:
-                                        for style_assignment in styled_item.Styles:
-                                            color = self._extract_color_from_style(style_assignment)
-                                            if color:
-                                                style_info.update(color)
-                                                logger.debug(f"Found color via HasStyledItem for element {element.id()}")
-                                                break
-                                    if style_info:
-                                        break
-                            
-                            if style_info:
-                                break
-                    if style_info:
+                    color = self._extract_color_from_items(getattr(representation, 'Items', None) or ())
+                    if color:
+                        style_info.update(color)
+                        logger.debug(f"Found color via IfcStyledItem for element {element.id()}")
                         break
             
             # Method 2: IfcPresentationStyleAssignment (older IFC versions)
@@ -2497,30 +2794,16 @@ class IFCImporter(BaseImporter):
                         material_select = assoc.RelatingMaterial
                         
                         # Check if material has representation with styles
-                        if hasattr(material_select, 'HasRepresentation'):
-                            for material_rep in material_select.HasRepresentation:
-                                if hasattr(material_rep, 'Representations'):
-                                    for rep in material_rep.Representations:
-                                        if hasattr(rep, 'Items'):
-                                            for item in rep.Items:
-                                                # Check for styled items in material representation
-                                                if hasattr(item, 'StyledByItem') and item.StyledByItem:
-                                                    for styled_item in item.StyledByItem:
-                                                        if hasattr(styled_item, 'Styles') and styled_item.Styles:
-                                                            for style_assignment in styled_item.Styles:
-                                                                color = self._extract_color_from_style(style_assignment)
-                                                                if color:
-                                                                    style_info.update(color)
-                                                                    logger.debug(f"Found color via material representation for element {element.id()}")
-                                                                    break
-                                                        if style_info:
-                                                            break
-                                                if style_info:
-                                                    break
-                                        if style_info:
-                                            break
-                                if style_info:
+                        for material_rep in getattr(material_select, 'HasRepresentation', None) or ():
+                            for rep in getattr(material_rep, 'Representations', None) or ():
+                                # Check for styled items in material representation
+                                color = self._extract_color_from_items(getattr(rep, 'Items', None) or ())
+                                if color:
+                                    style_info.update(color)
+                                    logger.debug(f"Found color via material representation for element {element.id()}")
                                     break
+                            if style_info:
+                                break
                         if style_info:
                             break
             
@@ -2532,7 +2815,7 @@ class IFCImporter(BaseImporter):
                         if hasattr(type_rel, 'RelatingType') and type_rel.RelatingType:
                             type_obj = type_rel.RelatingType
                             # Extract color from type's representation
-                            type_color = self._extract_color_and_style(type_obj)
+                            type_color = self._extract_color_and_style_cached(type_obj)
                             if type_color and 'color' in type_color:
                                 style_info.update(type_color)
                                 logger.debug(f"Found color via type definition for element {element.id()}")
@@ -2541,61 +2824,44 @@ class IFCImporter(BaseImporter):
             # Method 5: IfcMappedItem - resolve mapped representations
             if not style_info and hasattr(element, 'Representation') and element.Representation:
                 for representation in element.Representation.Representations:
-                    if hasattr(representation, 'Items'):
-                        for item in representation.Items:
-                            # Check if item is a mapped item (references shared geometry)
-                            if item.is_a("IfcMappedItem"):
-                                if hasattr(item, 'MappingSource') and item.MappingSource:
-                                    mapping_source = item.MappingSource
-                                    if hasattr(mapping_source, 'MappedRepresentation') and mapping_source.MappedRepresentation:
-                                        mapped_rep = mapping_source.MappedRepresentation
-                                        # Extract colors from mapped representation
-                                        if hasattr(mapped_rep, 'Items'):
-                                            for mapped_item in mapped_rep.Items:
-                                                if hasattr(mapped_item, 'StyledByItem') and mapped_item.StyledByItem:
-                                                    for styled_item in mapped_item.StyledByItem:
-                                                        if hasattr(styled_item, 'Styles') and styled_item.Styles:
-                                                            for style_assignment in styled_item.Styles:
-                                                                color = self._extract_color_from_style(style_assignment)
-                                                                if color:
-                                                                    style_info.update(color)
-                                                                    logger.debug(f"Found color via IfcMappedItem for element {element.id()}")
-                                                                    break
-                                                        if style_info:
-                                                            break
-                                                if style_info:
-                                                    break
-                                    if style_info:
-                                        break
-                            if style_info:
-                                break
+                    for item in getattr(representation, 'Items', None) or ():
+                        # Check if item is a mapped item (references shared geometry)
+                        if item.is_a("IfcMappedItem"):
+                            mapping_source = getattr(item, 'MappingSource', None)
+                            mapped_rep = getattr(mapping_source, 'MappedRepresentation', None) if mapping_source else None
+                            if mapped_rep:
+                                # Extract colors from mapped representation
+                                color = self._extract_color_from_items(getattr(mapped_rep, 'Items', None) or ())
+                                if color:
+                                    style_info.update(color)
+                                    logger.debug(f"Found color via IfcMappedItem for element {element.id()}")
+                                    break
                     if style_info:
                         break
             
             # Method 6: Check all IfcStyledItem relationships globally (some IFC files store styles separately)
             if not style_info:
                 try:
-                    # Get all IfcStyledItem entities and check if they reference this element
-                    all_styled_items = self.ifc_file.by_type("IfcStyledItem")
-                    for styled_item in all_styled_items:
-                        # Check if styled item references this element's representation items
-                        if hasattr(styled_item, 'Item') and styled_item.Item:
-                            item = styled_item.Item
-                            # Check if this item belongs to our element's representation
-                            if hasattr(element, 'Representation') and element.Representation:
-                                for representation in element.Representation.Representations:
-                                    if hasattr(representation, 'Items') and item in representation.Items:
-                                        if hasattr(styled_item, 'Styles') and styled_item.Styles:
-                                            for style_assignment in styled_item.Styles:
-                                                color = self._extract_color_from_style(style_assignment)
-                                                if color:
-                                                    style_info.update(color)
-                                                    logger.debug(f"Found color via global IfcStyledItem search for element {element.id()}")
-                                                    break
-                                        if style_info:
+                    # Look up the IfcStyledItems referencing this element's representation items
+                    # in an index built once, instead of scanning every IfcStyledItem per element
+                    styled_items_by_item = self._get_styled_items_index()
+                    product_rep = getattr(element, 'Representation', None)
+                    if styled_items_by_item and product_rep:
+                        for representation in product_rep.Representations:
+                            for item in getattr(representation, 'Items', None) or ():
+                                for styled_item in styled_items_by_item.get(item.id(), ()):
+                                    for style_assignment in getattr(styled_item, 'Styles', None) or ():
+                                        color = self._extract_color_from_style(style_assignment)
+                                        if color:
+                                            style_info.update(color)
+                                            logger.debug(f"Found color via global IfcStyledItem search for element {element.id()}")
                                             break
+                                    if style_info:
+                                        break
                                 if style_info:
                                     break
+                            if style_info:
+                                break
                 except Exception as e:
                     logger.debug(f"Error in global IfcStyledItem search: {e}")
             
@@ -2615,7 +2881,7 @@ class IFCImporter(BaseImporter):
             # Method 8: Check material properties for color information
             if not style_info:
                 try:
-                    material_props = self._extract_material_properties(element)
+                    material_props = self._extract_material_properties_cached(element)
                     if material_props and 'color_style' in material_props:
                         color_style = material_props['color_style']
                         if color_style and 'color' in color_style:
@@ -2661,6 +2927,51 @@ class IFCImporter(BaseImporter):
         
         return style_info
     
+    def _get_styled_items_index(self) -> Dict[int, list]:
+        """
+        Index IfcStyledItem entities by the representation item they style,
+        built once per opened file.
+        
+        Returns:
+            Dictionary of representation item id -> list of IfcStyledItem
+        """
+        if self._styled_items_by_item is None:
+            index: Dict[int, list] = {}
+            for styled_item in self._cached_by_type("IfcStyledItem"):
+                item = getattr(styled_item, 'Item', None)
+                if item:
+                    index.setdefault(item.id(), []).append(styled_item)
+            self._styled_items_by_item = index
+        return self._styled_items_by_item
+    
+    def _extract_color_from_items(self, items) -> Dict:
+        """
+        Extract the first color styled onto any of the given representation items.
+        Follows each styled-item relation in STYLED_ITEM_ATTRS to its style assignments.
+        Which of those relations an item type has is resolved once per type, so
+        items don't probe attribute names their schema doesn't define.
+        
+        Args:
+            items: IFC representation items
+        
+        Returns:
+            Dictionary with color information (empty if no styled color is found)
+        """
+        attrs_by_type = self._styled_item_attrs_by_type
+        for item in items:
+            item_type = item.is_a()
+            styled_attrs = attrs_by_type.get(item_type)
+            if styled_attrs is None:
+                styled_attrs = tuple(attr for attr in STYLED_ITEM_ATTRS if hasattr(item, attr))
+                attrs_by_type[item_type] = styled_attrs
+            for styled_attr in styled_attrs:
+                for styled_item in getattr(item, styled_attr, None) or ():
+                    for style_assignment in getattr(styled_item, 'Styles', None) or ():
+                        color = self._extract_color_from_style(style_assignment)
+                        if color:
+                            return color
+        return {}
+    
     def _extract_window_specific_color(self, window_elem) -> Dict:
         """
         Extract color specifically for windows using 6 window-specific methods.
@@ -2691,7 +3002,7 @@ class IFCImporter(BaseImporter):
                     if hasattr(type_rel, 'RelatingType') and type_rel.RelatingType:
                         window_type = type_rel.RelatingType
                         # Extract color from window type
-                        type_color = self._extract_color_and_style(window_type)
+                        type_color = self._extract_color_and_style_cached(window_type)
                         if type_color and 'color' in type_color:
                             style_info.update(type_color)
                             logger.debug(f"Found window color via window type for {window_elem.id()}")
@@ -2700,20 +3011,15 @@ class IFCImporter(BaseImporter):
             # Method 2: Check opening element that contains this window
             # Windows are often placed in openings, and the opening might have the color
             try:
-                # Find opening that contains this window
-                openings = self.ifc_file.by_type("IfcOpeningElement")
-                for opening in openings:
-                    # Check if window fills this opening
-                    if hasattr(opening, 'HasFillings'):
-                        for filling_rel in opening.HasFillings:
-                            if hasattr(filling_rel, 'RelatedBuildingElement'):
-                                if filling_rel.RelatedBuildingElement == window_elem:
-                                    # Extract color from opening
-                                    opening_color = self._extract_color_and_style(opening)
-                                    if opening_color and 'color' in opening_color:
-                                        style_info.update(opening_color)
-                                        logger.debug(f"Found window color via opening element for {window_elem.id()}")
-                                        return style_info
+                # Find openings filled by this window
+                _, openings_by_filling = self._get_fills_index()
+                for opening in openings_by_filling.get(window_elem.id(), ()):
+                    # Extract color from opening
+                    opening_color = self._extract_color_and_style_cached(opening)
+                    if opening_color and 'color' in opening_color:
+                        style_info.update(opening_color)
+                        logger.debug(f"Found window color via opening element for {window_elem.id()}")
+                        return style_info
             except Exception as e:
                 logger.debug(f"Error checking opening elements for window {window_elem.id()}: {e}")
             
@@ -2725,69 +3031,63 @@ class IFCImporter(BaseImporter):
                     for decomp_rel in window_elem.IsDecomposedBy:
                         if hasattr(decomp_rel, 'RelatedObjects'):
                             for part in decomp_rel.RelatedObjects:
-                                # Check for glazing panels (IfcPlate)
-                                if part.is_a("IfcPlate") or part.is_a("IfcMember"):
-                                    part_color = self._extract_color_and_style(part)
+                                # Check for glazing panels (IfcPlate) and frames (IfcMember)
+                                part_type = part.is_a()
+                                if part_type in WINDOW_PART_TYPES:
+                                    part_color = self._extract_color_and_style_cached(part)
                                     if part_color and 'color' in part_color:
                                         style_info.update(part_color)
-                                        logger.debug(f"Found window color via window part ({part.is_a()}) for {window_elem.id()}")
+                                        logger.debug(f"Found window color via window part ({part_type}) for {window_elem.id()}")
                                         return style_info
             except Exception as e:
                 logger.debug(f"Error checking window parts for {window_elem.id()}: {e}")
             
             # Method 4: Check for window in wall (wall opening might have color)
             try:
-                # Find walls that have openings containing this window
-                walls = self.ifc_file.by_type("IfcWall") + self.ifc_file.by_type("IfcWallStandardCase")
-                for wall in walls:
-                    if hasattr(wall, 'HasOpenings'):
-                        for opening_rel in wall.HasOpenings:
-                            if hasattr(opening_rel, 'RelatedOpeningElement'):
-                                opening = opening_rel.RelatedOpeningElement
-                                if opening and opening.is_a("IfcOpeningElement"):
-                                    # Check if this opening is filled by our window
-                                    if hasattr(opening, 'HasFillings'):
-                                        for filling_rel in opening.HasFillings:
-                                            if hasattr(filling_rel, 'RelatedBuildingElement'):
-                                                if filling_rel.RelatedBuildingElement == window_elem:
-                                                    # Try to get color from opening first (more specific)
-                                                    opening_color = self._extract_color_and_style(opening)
-                                                    if opening_color and 'color' in opening_color:
-                                                        style_info.update(opening_color)
-                                                        logger.debug(f"Found window color via opening element for {window_elem.id()}")
-                                                        return style_info
-                                                    
-                                                    # Try to get color from wall (some IFC files assign window color via wall)
-                                                    wall_color = self._extract_color_and_style(wall)
-                                                    if wall_color and 'color' in wall_color:
-                                                        # Use wall color as fallback, but prefer window-specific
-                                                        if not style_info:
-                                                            style_info.update(wall_color)
-                                                            logger.debug(f"Found window color via wall for {window_elem.id()}")
+                # Walk from the window to the openings it fills (FillsVoids) and from
+                # there to the hosting walls (VoidsElements) instead of scanning all walls
+                for fills_rel in getattr(window_elem, 'FillsVoids', None) or ():
+                    opening = getattr(fills_rel, 'RelatingOpeningElement', None)
+                    if opening and opening.is_a("IfcOpeningElement"):
+                        # Try to get color from opening first (more specific)
+                        opening_color = self._extract_color_and_style_cached(opening)
+                        if opening_color and 'color' in opening_color:
+                            style_info.update(opening_color)
+                            logger.debug(f"Found window color via opening element for {window_elem.id()}")
+                            return style_info
+                        
+                        # Try to get color from wall (some IFC files assign window color via wall)
+                        for voids_rel in getattr(opening, 'VoidsElements', None) or ():
+                            wall = getattr(voids_rel, 'RelatingBuildingElement', None)
+                            if wall and wall.is_a("IfcWall"):
+                                wall_color = self._extract_color_and_style_cached(wall)
+                                if wall_color and 'color' in wall_color:
+                                    # Use wall color as fallback, but prefer window-specific
+                                    if not style_info:
+                                        style_info.update(wall_color)
+                                        logger.debug(f"Found window color via wall for {window_elem.id()}")
             except Exception as e:
                 logger.debug(f"Error checking wall openings for window {window_elem.id()}: {e}")
             
             # Method 5: Check all IfcPlate elements (glazing panels) and see if they're related to this window
             try:
                 # Check using IfcRelContainedInSpatialStructure relationship
-                contained_rels = self.ifc_file.by_type("IfcRelContainedInSpatialStructure")
-                for rel in contained_rels:
-                    if hasattr(rel, 'RelatingStructure') and rel.RelatingStructure == window_elem:
-                        if hasattr(rel, 'RelatedElements'):
-                            for elem in rel.RelatedElements:
-                                # Check if it's a plate (glazing) or member (frame)
-                                if elem.is_a("IfcPlate") or elem.is_a("IfcMember"):
-                                    elem_color = self._extract_color_and_style(elem)
-                                    if elem_color and 'color' in elem_color:
-                                        style_info.update(elem_color)
-                                        logger.debug(f"Found window color via contained element ({elem.is_a()}) for {window_elem.id()}")
-                                        return style_info
+                elements_by_structure, _ = self._get_spatial_index()
+                for elem in elements_by_structure.get(window_elem.id(), ()):
+                    # Check if it's a plate (glazing) or member (frame)
+                    elem_type = elem.is_a()
+                    if elem_type in WINDOW_PART_TYPES:
+                        elem_color = self._extract_color_and_style_cached(elem)
+                        if elem_color and 'color' in elem_color:
+                            style_info.update(elem_color)
+                            logger.debug(f"Found window color via contained element ({elem_type}) for {window_elem.id()}")
+                            return style_info
                 
                 # Also check plates that might be spatially near the window
-                plates = self.ifc_file.by_type("IfcPlate")
+                plates = self._cached_by_type("IfcPlate")
                 for plate in plates:
                     # Check if plate is in same space/storey as window (might be window glazing)
-                    plate_color = self._extract_color_and_style(plate)
+                    plate_color = self._extract_color_and_style_cached(plate)
                     if plate_color and 'color' in plate_color:
                         # If we don't have a color yet, use plate color as potential match
                         if not style_info:
@@ -2844,7 +3144,7 @@ class IFCImporter(BaseImporter):
                         if hasattr(decomp_rel, 'RelatedObjects'):
                             for part in decomp_rel.RelatedObjects:
                                 # Extract material from window part
-                                part_material = self._extract_material_properties(part)
+                                part_material = self._extract_material_properties_cached(part)
                                 if part_material and 'color_style' in part_material:
                                     color_style = part_material['color_style']
                                     if color_style and 'color' in color_style:
@@ -2900,7 +3200,7 @@ class IFCImporter(BaseImporter):
     def _extract_color_from_style(self, style_assignment) -> Dict:
         """
         Extract color from IFC style assignment.
-        Handles multiple IFC style types recursively.
+        Handles multiple (nested) IFC style types.
         
         Args:
             style_assignment: IFC style assignment (IfcPresentationStyleAssignment, IfcSurfaceStyle, etc.)
@@ -2910,128 +3210,123 @@ class IFCImporter(BaseImporter):
         """
         style_info = {}
         
-        try:
-            # Handle IfcPresentationStyleAssignment
-            if style_assignment.is_a("IfcPresentationStyleAssignment"):
-                if hasattr(style_assignment, 'Styles') and style_assignment.Styles:
-                    for style in style_assignment.Styles:
-                        result = self._extract_color_from_style(style)
-                        if result:
-                            style_info.update(result)
-            
-            # Handle IfcSurfaceStyle
-            elif style_assignment.is_a("IfcSurfaceStyle"):
-                if hasattr(style_assignment, 'Styles') and style_assignment.Styles:
-                    for style in style_assignment.Styles:
-                        result = self._extract_color_from_style(style)
-                        if result:
-                            style_info.update(result)
-            
-            # Handle IfcSurfaceStyleShading (basic color)
-            elif style_assignment.is_a("IfcSurfaceStyleShading"):
-                # Try SurfaceColour first (IFC4)
-                if hasattr(style_assignment, 'SurfaceColour') and style_assignment.SurfaceColour:
-                    colour = style_assignment.SurfaceColour
-                    # IFC4 uses ColourComponents
-                    if hasattr(colour, 'ColourComponents'):
-                        components = colour.ColourComponents
-                        if len(components) >= 3:
+        # Walk nested style containers depth-first with an explicit stack instead of
+        # recursion; leaf styles are merged in document order (later styles win)
+        stack = [style_assignment]
+        while stack:
+            style = stack.pop()
+            try:
+                # Handle IfcPresentationStyleAssignment and IfcSurfaceStyle (style containers)
+                if style.is_a("IfcPresentationStyleAssignment") or style.is_a("IfcSurfaceStyle"):
+                    styles = getattr(style, 'Styles', None)
+                    if styles:
+                        stack.extend(reversed(styles))
+                
+                # Handle IfcSurfaceStyleShading (basic color)
+                elif style.is_a("IfcSurfaceStyleShading"):
+                    # Try SurfaceColour first (IFC4)
+                    if hasattr(style, 'SurfaceColour') and style.SurfaceColour:
+                        colour = style.SurfaceColour
+                        # IFC4 uses ColourComponents
+                        if hasattr(colour, 'ColourComponents'):
+                            components = colour.ColourComponents
+                            if len(components) >= 3:
+                                style_info['color'] = (
+                                    float(components[0]),
+                                    float(components[1]),
+                                    float(components[2])
+                                )
+                                style_info['style_type'] = 'IfcSurfaceStyleShading'
+                        # IFC2X3 uses Red, Green, Blue attributes
+                        elif hasattr(colour, 'Red') and hasattr(colour, 'Green') and hasattr(colour, 'Blue'):
                             style_info['color'] = (
-                                float(components[0]),
-                                float(components[1]),
-                                float(components[2])
+                                float(colour.Red),
+                                float(colour.Green),
+                                float(colour.Blue)
                             )
                             style_info['style_type'] = 'IfcSurfaceStyleShading'
-                    # IFC2X3 uses Red, Green, Blue attributes
-                    elif hasattr(colour, 'Red') and hasattr(colour, 'Green') and hasattr(colour, 'Blue'):
-                        style_info['color'] = (
-                            float(colour.Red),
-                            float(colour.Green),
-                            float(colour.Blue)
-                        )
-                        style_info['style_type'] = 'IfcSurfaceStyleShading'
-            
-            # Handle IfcSurfaceStyleRendering (advanced rendering with transparency, reflectance)
-            elif style_assignment.is_a("IfcSurfaceStyleRendering"):
-                # Try SurfaceColour first (IFC4)
-                if hasattr(style_assignment, 'SurfaceColour') and style_assignment.SurfaceColour:
-                    colour = style_assignment.SurfaceColour
-                    # IFC4 uses ColourComponents
-                    if hasattr(colour, 'ColourComponents'):
-                        components = colour.ColourComponents
-                        if len(components) >= 3:
+            
+                # Handle IfcSurfaceStyleRendering (advanced rendering with transparency, reflectance)
+                elif style.is_a("IfcSurfaceStyleRendering"):
+                    # Try SurfaceColour first (IFC4)
+                    if hasattr(style, 'SurfaceColour') and style.SurfaceColour:
+                        colour = style.SurfaceColour
+                        # IFC4 uses ColourComponents
+                        if hasattr(colour, 'ColourComponents'):
+                            components = colour.ColourComponents
+                            if len(components) >= 3:
+                                style_info['color'] = (
+                                    float(components[0]),
+                                    float(components[1]),
+                                    float(components[2])
+                                )
+                                style_info['style_type'] = 'IfcSurfaceStyleRendering'
+                        # IFC2X3 uses Red, Green, Blue attributes
+                        elif hasattr(colour, 'Red') and hasattr(colour, 'Green') and hasattr(colour, 'Blue'):
                             style_info['color'] = (
-                                float(components[0]),
-                                float(components[1]),
-                                float(components[2])
+                                float(colour.Red),
+                                float(colour.Green),
+                                float(colour.Blue)
                             )
                             style_info['style_type'] = 'IfcSurfaceStyleRendering'
-                    # IFC2X3 uses Red, Green, Blue attributes
-                    elif hasattr(colour, 'Red') and hasattr(colour, 'Green') and hasattr(colour, 'Blue'):
-                        style_info['color'] = (
-                            float(colour.Red),
-                            float(colour.Green),
-                            float(colour.Blue)
-                        )
-                        style_info['style_type'] = 'IfcSurfaceStyleRendering'
                 
-                # Extract transparency (0.0 = opaque, 1.0 = fully transparent)
-                if hasattr(style_assignment, 'Transparency'):
-                    style_info['transparency'] = float(style_assignment.Transparency)
+                    # Extract transparency (0.0 = opaque, 1.0 = fully transparent)
+                    if hasattr(style, 'Transparency'):
+                        style_info['transparency'] = float(style.Transparency)
                 
-                # Extract reflectance method
-                if hasattr(style_assignment, 'ReflectanceMethod'):
-                    style_info['reflectance_method'] = str(style_assignment.ReflectanceMethod)
+                    # Extract reflectance method
+                    if hasattr(style, 'ReflectanceMethod'):
+                        style_info['reflectance_method'] = str(style.ReflectanceMethod)
                 
-                # Extract diffuse color (if different from surface color)
-                if hasattr(style_assignment, 'DiffuseColour'):
-                    diffuse = style_assignment.DiffuseColour
-                    if hasattr(diffuse, 'ColourComponents'):
-                        components = diffuse.ColourComponents
-                        if len(components) >= 3:
-                            style_info['diffuse_color'] = (
-                                float(components[0]),
-                                float(components[1]),
-                                float(components[2])
-                            )
+                    # Extract diffuse color (if different from surface color)
+                    if hasattr(style, 'DiffuseColour'):
+                        diffuse = style.DiffuseColour
+                        if hasattr(diffuse, 'ColourComponents'):
+                            components = diffuse.ColourComponents
+                            if len(components) >= 3:
+                                style_info['diffuse_color'] = (
+                                    float(components[0]),
+                                    float(components[1]),
+                                    float(components[2])
+                                )
                 
-                # Extract specular color
-                if hasattr(style_assignment, 'SpecularColour'):
-                    specular = style_assignment.SpecularColour
-                    if hasattr(specular, 'ColourComponents'):
-                        components = specular.ColourComponents
-                        if len(components) >= 3:
-                            style_info['specular_color'] = (
-                                float(components[0]),
-                                float(components[1]),
-                                float(components[2])
-                            )
-            
-            # Handle IfcSurfaceStyleWithTextures (texture-based)
-            elif style_assignment.is_a("IfcSurfaceStyleWithTextures"):
-                if hasattr(style_assignment, 'Textures'):
-                    textures = []
-                    for texture in style_assignment.Textures:
-                        texture_info = {}
-                        if hasattr(texture, 'RepeatS'):
-                            texture_info['repeat_s'] = bool(texture.RepeatS)
-                        if hasattr(texture, 'RepeatT'):
-                            texture_info['repeat_t'] = bool(texture.RepeatT)
-                        if hasattr(texture, 'Mode'):
-                            texture_info['mode'] = str(texture.Mode)
-                        # Texture reference (IfcImageTexture, IfcPixelTexture, etc.)
-                        if hasattr(texture, 'TextureMap'):
-                            texture_info['texture_map'] = str(texture.TextureMap)
-                        # Extract texture coordinates if available
-                        if hasattr(texture, 'TextureCoordinates'):
-                            texture_info['texture_coordinates'] = str(texture.TextureCoordinates)
-                        textures.append(texture_info)
-                    if textures:
-                        style_info['textures'] = textures
-                        style_info['style_type'] = 'IfcSurfaceStyleWithTextures'
+                    # Extract specular color
+                    if hasattr(style, 'SpecularColour'):
+                        specular = style.SpecularColour
+                        if hasattr(specular, 'ColourComponents'):
+                            components = specular.ColourComponents
+                            if len(components) >= 3:
+                                style_info['specular_color'] = (
+                                    float(components[0]),
+                                    float(components[1]),
+                                    float(components[2])
+                                )
+            
+                # Handle IfcSurfaceStyleWithTextures (texture-based)
+                elif style.is_a("IfcSurfaceStyleWithTextures"):
+                    if hasattr(style, 'Textures'):
+                        textures = []
+                        for texture in style.Textures:
+                            texture_info = {}
+                            if hasattr(texture, 'RepeatS'):
+                                texture_info['repeat_s'] = bool(texture.RepeatS)
+                            if hasattr(texture, 'RepeatT'):
+                                texture_info['repeat_t'] = bool(texture.RepeatT)
+                            if hasattr(texture, 'Mode'):
+                                texture_info['mode'] = str(texture.Mode)
+                            # Texture reference (IfcImageTexture, IfcPixelTexture, etc.)
+                            if hasattr(texture, 'TextureMap'):
+                                texture_info['texture_map'] = str(texture.TextureMap)
+                            # Extract texture coordinates if available
+                            if hasattr(texture, 'TextureCoordinates'):
+                                texture_info['texture_coordinates'] = str(texture.TextureCoordinates)
+                            textures.append(texture_info)
+                        if textures:
+                            style_info['textures'] = textures
+                            style_info['style_type'] = 'IfcSurfaceStyleWithTextures'
         
-        except Exception as e:
-            logger.debug(f"Error extracting color from style: {e}")
+            except Exception as e:
+                logger.debug(f"Error extracting color from style: {e}")
         
         return style_info
     
@@ -3094,10 +3389,12 @@ class IFCImporter(BaseImporter):
             metadata['element_type_hierarchy'] = type_hierarchy
             
             # ELEMENT IDENTIFICATION
-            if hasattr(element, 'Name') and element.Name:
-                metadata['element_name'] = str(element.Name)
-            if hasattr(element, 'GlobalId') and element.GlobalId:
-                metadata['element_global_id'] = str(element.GlobalId)
+            element_name = getattr(element, 'Name', None)
+            if element_name:
+                metadata['element_name'] = str(element_name)
+            global_id = getattr(element, 'GlobalId', None)
+            if global_id:
+                metadata['element_global_id'] = str(global_id)
             elif hasattr(element, 'id'):
                 metadata['element_global_id'] = f"#{element.id()}"
             
@@ -3149,7 +3446,7 @@ class IFCImporter(BaseImporter):
                     logger.debug(f"Error extracting color from shape: {e}")
             
             # Method 2: Comprehensive color/style extraction from element
-            color_style = self._extract_color_and_style(element)
+            color_style = self._extract_color_and_style_cached(element)
             if color_style:
                 metadata['color_style'] = color_style
                 # If we got color from shape but not from element, use shape color
@@ -3175,7 +3472,7 @@ class IFCImporter(BaseImporter):
                     metadata['color_style']['color_source'] = 'window_specific'
             
             # MATERIAL EXTRACTION: Comprehensive material properties
-            material_props = self._extract_material_properties(element)
+            material_props = self._extract_material_properties_cached(element)
             if material_props:
                 metadata['material_properties'] = material_props
                 metadata['material_name'] = material_props.get('name')
@@ -3198,39 +3495,34 @@ class IFCImporter(BaseImporter):
                 metadata['is_window'] = True
             elif element_type == "IfcPlate":
                 # Check if plate is glazing
-                plate_name = metadata.get('element_name', '').lower()
+                plate_name = metadata.get('element_name', '')
                 if (metadata.get('has_glazing') or 
-                    any(kw in plate_name for kw in ['glass', 'glazing', 'verre', 'стекло', 'vitrage', 'pane', 'window', 'окно'])):
+                    GLAZING_KEYWORDS_RE.search(plate_name) or WINDOW_KEYWORDS_RE.search(plate_name)):
                     metadata['is_window'] = True
             elif element_type == "IfcOpeningElement":
                 # Check if opening is for window (not door)
-                opening_name = metadata.get('element_name', '').lower()
+                opening_name = metadata.get('element_name', '')
                 if opening_name:
-                    if not any(kw in opening_name for kw in ['door', 'дверь', 'porte', 'tür', 'entrance']):
+                    if not DOOR_KEYWORDS_RE.search(opening_name):
                         metadata['is_window'] = True
                 else:
                     # Default: treat as window if no door keywords
                     metadata['is_window'] = True
             
             # PROPERTIES EXTRACTION: Get element properties
+            # Only single-value properties of the element's own property sets (values unwrapped)
             try:
-                if hasattr(element, 'IsDefinedBy'):
-                    for prop_def in element.IsDefinedBy:
-                        if prop_def.is_a("IfcRelDefinesByProperties"):
-                            if hasattr(prop_def, 'RelatingPropertyDefinition'):
-                                prop_set = prop_def.RelatingPropertyDefinition
-                                if prop_set.is_a("IfcPropertySet"):
-                                    if hasattr(prop_set, 'HasProperties'):
-                                        for prop in prop_set.HasProperties:
-                                            if hasattr(prop, 'Name'):
-                                                prop_name = prop.Name
-                                                if prop.is_a("IfcPropertySingleValue"):
-                                                    if hasattr(prop, 'NominalValue') and prop.NominalValue:
-                                                        prop_value = prop.NominalValue
-                                                        if hasattr(prop_value, 'wrappedValue'):
-                                                            metadata['properties'][prop_name] = prop_value.wrappedValue
-                                                        else:
-                                                            metadata['properties'][prop_name] = prop_value
+                for prop_def in getattr(element, 'IsDefinedBy', None) or ():
+                    if not prop_def.is_a("IfcRelDefinesByProperties"):
+                        continue
+                    prop_set = getattr(prop_def, 'RelatingPropertyDefinition', None)
+                    if prop_set is None or not prop_set.is_a("IfcPropertySet"):
+                        continue
+                    for prop in getattr(prop_set, 'HasProperties', None) or ():
+                        if prop.is_a("IfcPropertySingleValue"):
+                            nominal_value = getattr(prop, 'NominalValue', None)
+                            if nominal_value:
+                                metadata['properties'][prop.Name] = _unwrap(nominal_value)
             except Exception as e:
                 logger.debug(f"Error extracting properties: {e}")
             
@@ -3348,70 +3640,21 @@ class IFCImporter(BaseImporter):
             logger.info("IFC geometry settings configured for maximum accuracy and completeness")
             
             # CRITICAL: Get ALL IfcProduct elements including nested/aggregated parts
-            # This ensures we capture EVERY geometric element, including:
-            # - Main elements (walls, windows, doors, etc.)
-            # - Building element parts (IfcBuildingElementPart)
-            # - Element assemblies (IfcElementAssembly)
-            # - Aggregated elements (via IfcRelAggregates)
+            # by_type("IfcProduct") includes every subtype, so building element parts
+            # (IfcBuildingElementPart), element assemblies (IfcElementAssembly) and
+            # aggregated children (IfcRelAggregates) are already part of this list.
+            # Products without a Representation (e.g. spatial containers) are filtered
+            # out up front (on the by-type fallback path too) - no shape can be created for them.
             all_products = []
-            processed_ids = set()  # Track processed elements to avoid duplicates
             
             try:
                 # Get all IfcProduct elements (base class for all geometric elements)
-                base_products = self.ifc_file.by_type("IfcProduct")
+                base_products = self._cached_by_type("IfcProduct")
                 logger.info(f"Found {len(base_products)} base IfcProduct element(s)")
                 
-                # Add all base products
-                for product in base_products:
-                    product_id = product.id()
-                    if product_id not in processed_ids:
-                        all_products.append(product)
-                        processed_ids.add(product_id)
-                
-                # CRITICAL: Also get all building element parts and assemblies
-                # These are often nested and might be missed
-                try:
-                    parts = self.ifc_file.by_type("IfcBuildingElementPart")
-                    logger.info(f"Found {len(parts)} IfcBuildingElementPart element(s)")
-                    for part in parts:
-                        part_id = part.id()
-                        if part_id not in processed_ids:
-                            all_products.append(part)
-                            processed_ids.add(part_id)
-                except:
-                    pass
-                
-                try:
-                    assemblies = self.ifc_file.by_type("IfcElementAssembly")
-                    logger.info(f"Found {len(assemblies)} IfcElementAssembly element(s)")
-                    for assembly in assemblies:
-                        assembly_id = assembly.id()
-                        if assembly_id not in processed_ids:
-                            all_products.append(assembly)
-                            processed_ids.add(assembly_id)
-                except:
-                    pass
-                
-                # CRITICAL: Process aggregation relationships (IfcRelAggregates)
-                # Elements can be aggregated (parent-child relationships)
-                # We need to process both parent and children
-                try:
-                    aggregations = self.ifc_file.by_type("IfcRelAggregates")
-                    logger.info(f"Found {len(aggregations)} IfcRelAggregates relationship(s)")
-                    for agg_rel in aggregations:
-                        # Process related objects (children)
-                        if hasattr(agg_rel, 'RelatedObjects'):
-                            for related_obj in agg_rel.RelatedObjects:
-                                if related_obj.is_a("IfcProduct"):
-                                    related_id = related_obj.id()
-                                    if related_id not in processed_ids:
-                                        all_products.append(related_obj)
-                                        processed_ids.add(related_id)
-                                        logger.debug(f"Added aggregated element: {related_obj.is_a()} {related_id}")
-                except Exception as e:
-                    logger.debug(f"Could not process aggregations: {e}")
-                
-                logger.info(f"Total unique elements to process: {len(all_products)}")
+                all_products = [product for product in base_products if getattr(product, 'Representation', None)]
+                logger.info(f"Total elements with a representation to process: {len(all_products)} "
+                            f"({len(base_products) - len(all_products)} without representation skipped)")
                 
             except Exception as e:
                 logger.warning(f"Could not get all IfcProduct elements: {e}")
@@ -3423,24 +3666,27 @@ class IFCImporter(BaseImporter):
                                      "IfcPlate", "IfcRailing", "IfcCurtainWall", "IfcBuildingElementProxy",
                                      "IfcBuildingElementPart", "IfcElementAssembly"]:
                     try:
-                        elements = self.ifc_file.by_type(element_type)
-                        all_products.extend(elements)
+                        elements = self._cached_by_type(element_type)
+                        all_products.extend(product for product in elements if getattr(product, 'Representation', None))
                     except:
                         continue
-                logger.info(f"Fallback found {len(all_products)} elements")
+                logger.info(f"Fallback found {len(all_products)} elements with a representation")
             
             total_elements = len(all_products)
             successful_elements = 0
             failed_elements = 0
             skipped_elements = 0
-            element_type_counts = {}  # Track counts by type
+            element_type_counts = Counter()  # Track counts by type
+            # Metadata summary counts, tallied as meshes are added
+            metadata_counts = Counter()  # 'color', 'material', 'properties', 'window'
+            material_types = Counter()
             
             logger.info(f"Processing {total_elements} elements for geometry extraction...")
             
             # Process each element
             for idx, element in enumerate(all_products):
                 element_type = element.is_a()
-                element_type_counts[element_type] = element_type_counts.get(element_type, 0) + 1
+                element_type_counts[element_type] += 1
                 
                 # Log progress every 100 elements
                 if (idx + 1) % 100 == 0:
@@ -3455,66 +3701,38 @@ class IFCImporter(BaseImporter):
                     # - Curve (2D curve representation)
                     # - FootPrint (footprint/plan view)
                     # - Surface (surface representation)
-                    # We try ALL representations to ensure we get geometry
+                    # We try the default (Body) representation first, then only the element's 3D fallback
+                    # representations (FALLBACK_REPRESENTATION_IDS); the default one is not tessellated twice
+                    representation = getattr(element, 'Representation', None)
+                    representations = [
+                        item for item in (getattr(representation, 'Representations', None) or [] if representation else [])
+                        if getattr(item, 'RepresentationIdentifier', None) in FALLBACK_REPRESENTATION_IDS
+                    ]
                     shape = None
-                    representation_index = 0
-                    max_representations = 10  # Try up to 10 different representations
                     representation_types = []  # Track which representations we tried
                     
-                    while shape is None and representation_index < max_representations:
+                    for representation_index in range(len(representations) + 1):
                         try:
-                            # Try creating shape with specific representation index
                             if representation_index == 0:
                                 # First try: default representation (usually Body)
-                                shape = geom.create_shape(settings, element)
                                 representation_types.append("default")
+                                shape = geom.create_shape(settings, element)
                             else:
-                                # Try other representations explicitly
-                                try:
-                                    shape = geom.create_shape(settings, element, representation_index)
-                                    representation_types.append(f"repr_{representation_index}")
-                                except Exception as repr_error:
-                                    # If representation index doesn't exist, try next
-                                    representation_index += 1
-                                    continue
-                            
-                            # Validate shape has geometry
-                            if shape and hasattr(shape, 'geometry') and shape.geometry:
-                                # Check if geometry has valid data
-                                geometry = shape.geometry
-                                has_valid_data = False
-                                
-                                # Check for vertices/faces
-                                if hasattr(geometry, 'verts') and hasattr(geometry, 'faces'):
-                                    if len(geometry.verts) > 0 and len(geometry.faces) > 0:
-                                        has_valid_data = True
-                                elif hasattr(geometry, 'tessellation'):
-                                    try:
-                                        tess = geometry.tessellation()
-                                        if tess and isinstance(tess, tuple) and len(tess) >= 2:
-                                            if len(tess[0]) > 0 and len(tess[1]) > 0:
-                                                has_valid_data = True
-                                    except:
-                                        pass
-                                
-                                if has_valid_data:
-                                    logger.debug(f"✓ Created shape for {element_type} {element.id()} using {representation_types[-1]}")
-                                    break
-                                else:
-                                    # Shape exists but has no valid geometry, try next representation
-                                    shape = None
-                                    representation_index += 1
-                            else:
-                                shape = None
-                                representation_index += 1
+                                # Try the element's 3D fallback representations explicitly
+                                item = representations[representation_index - 1]
+                                representation_types.append(item.RepresentationIdentifier)
+                                shape = geom.create_shape(settings, element, item)
                         except Exception as shape_error:
-                            # Try next representation
+                            logger.debug(f"Could not create {representation_types[-1]} shape for {element_type} {element.id()}: {shape_error}")
                             shape = None
-                            representation_index += 1
-                            if representation_index >= max_representations:
-                                logger.debug(f"Could not create shape for {element_type} {element.id()} after {max_representations} attempts: {shape_error}")
-                                skipped_elements += 1
-                                break
+                            continue
+                        
+                        # Validate shape has geometry
+                        if self._shape_has_geometry(shape):
+                            logger.debug(f"✓ Created shape for {element_type} {element.id()} using {representation_types[-1]}")
+                            break
+                        # Shape exists but has no valid geometry, try next representation
+                        shape = None
                     
                     if shape is None:
                         logger.debug(f"No valid shape found for {element_type} {element.id()} (tried {len(representation_types)} representations)")
@@ -3542,9 +3760,9 @@ class IFCImporter(BaseImporter):
                         if hasattr(geometry, 'tessellation'):
                             tess = geometry.tessellation()
                             if tess and isinstance(tess, tuple) and len(tess) >= 2:
-                                vertices = np.array(tess[0], dtype=np.float64)
+                                vertices = _as_flat_array(tess[0], np.float64)
                                 faces_data = tess[1]
-                                faces = np.array(faces_data, dtype=np.int32)
+                                faces = _as_flat_array(faces_data, np.int32)
                                 if len(faces.shape) == 1 and len(faces) % 3 == 0:
                                     faces = faces.reshape(-1, 3)
                                 logger.debug(f"✓ Extracted geometry using tessellation() for {element_type} {element.id()}")
@@ -3558,7 +3776,7 @@ class IFCImporter(BaseImporter):
                             faces_data = geometry.faces
                             
                             # Convert to numpy arrays
-                            vertices = np.array(verts, dtype=np.float64)
+                            vertices = _as_flat_array(verts, np.float64)
                             # Ensure vertices are in shape (n, 3)
                             if len(vertices.shape) == 1:
                                 if len(vertices) % 3 == 0:
@@ -3571,7 +3789,7 @@ class IFCImporter(BaseImporter):
                                 vertices = None
                             
                             if vertices is not None:
-                                faces = np.array(faces_data, dtype=np.int32)
+                                faces = _as_flat_array(faces_data, np.int32)
                                 # Ensure faces are in shape (n, 3)
                                 if len(faces.shape) == 1:
                                     if len(faces) % 3 == 0:
@@ -3617,9 +3835,9 @@ class IFCImporter(BaseImporter):
                                                 if hasattr(geom_obj, 'tessellation'):
                                                     tess = geom_obj.tessellation()
                                                     if tess and isinstance(tess, tuple) and len(tess) >= 2:
-                                                        vertices = np.array(tess[0], dtype=np.float64)
+                                                        vertices = _as_flat_array(tess[0], np.float64)
                                                         faces_data = tess[1]
-                                                        faces = np.array(faces_data, dtype=np.int32)
+                                                        faces = _as_flat_array(faces_data, np.int32)
                                                         if len(faces.shape) == 1 and len(faces) % 3 == 0:
                                                             faces = faces.reshape(-1, 3)
                                             except:
@@ -3636,9 +3854,9 @@ class IFCImporter(BaseImporter):
                                                                 attr_val = attr_val()
                                                             # Try to extract vertices/faces from attribute
                                                             if isinstance(attr_val, tuple) and len(attr_val) >= 2:
-                                                                vertices = np.array(attr_val[0], dtype=np.float64)
+                                                                vertices = _as_flat_array(attr_val[0], np.float64)
                                                                 faces_data = attr_val[1]
-                                                                faces = np.array(faces_data, dtype=np.int32)
+                                                                faces = _as_flat_array(faces_data, np.int32)
                                                                 if len(faces.shape) == 1 and len(faces) % 3 == 0:
                                                                     faces = faces.reshape(-1, 3)
                                                                 break
@@ -3654,9 +3872,9 @@ class IFCImporter(BaseImporter):
                             if hasattr(geometry, 'data'):
                                 data = geometry.data
                                 if hasattr(data, 'verts') and hasattr(data, 'faces'):
-                                    vertices = np.array(data.verts, dtype=np.float64)
+                                    vertices = _as_flat_array(data.verts, np.float64)
                                     faces_data = data.faces
-                                    faces = np.array(faces_data, dtype=np.int32)
+                                    faces = _as_flat_array(faces_data, np.int32)
                                     if len(faces.shape) == 1 and len(faces) % 3 == 0:
                                         faces = faces.reshape(-1, 3)
                                     logger.debug(f"✓ Extracted geometry using data.verts/faces for {element_type} {element.id()}")
@@ -3672,16 +3890,13 @@ class IFCImporter(BaseImporter):
                                 max_vertex_idx = np.max(faces)
                                 if max_vertex_idx >= len(vertices):
                                     # Filter out invalid faces
-                                    valid_faces = []
-                                    for face in faces:
-                                        if all(0 <= idx < len(vertices) for idx in face):
-                                            valid_faces.append(face)
-                                    if len(valid_faces) > 0:
-                                        faces = np.array(valid_faces, dtype=np.int32)
-                                    else:
+                                    num_vertices = len(vertices)
+                                    valid_mask = ((faces >= 0) & (faces < num_vertices)).all(axis=1)
+                                    if not valid_mask.any():
                                         logger.debug(f"All faces invalid for {element_type} {element.id()}")
                                         skipped_elements += 1
                                         continue
+                                    faces = np.ascontiguousarray(faces[valid_mask], dtype=np.int32)
                             
                             # Create mesh
                             mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
@@ -3804,7 +4019,7 @@ class IFCImporter(BaseImporter):
                                     # Method 2: Extract from element representation/material (comprehensive extraction)
                                     # This now includes 9 different extraction methods
                                     if not color_from_shape:
-                                        color_style = self._extract_color_and_style(element)
+                                        color_style = self._extract_color_and_style_cached(element)
                                         if color_style and 'color' in color_style:
                                             color_from_shape = color_style['color']
                                             logger.debug(f"Extracted color from element representation for {element_type} {element.id()}")
@@ -3820,7 +4035,7 @@ class IFCImporter(BaseImporter):
                                     # Method 2c: Check material properties for color (especially for windows)
                                     if not color_from_shape:
                                         try:
-                                            material_props = self._extract_material_properties(element)
+                                            material_props = self._extract_material_properties_cached(element)
                                             if material_props:
                                                 # Check if material has color_style
                                                 if 'color_style' in material_props:
@@ -3887,13 +4102,12 @@ class IFCImporter(BaseImporter):
                                             # Check if plate is a glazing panel (window)
                                             # Method 1: Check material for glazing
                                             try:
-                                                material_props = self._extract_material_properties(element)
+                                                material_props = self._extract_material_properties_cached(element)
                                                 if material_props:
                                                     if material_props.get('has_glazing') or material_props.get('is_window_material'):
                                                         is_window = True
                                                     else:
-                                                        material_name = material_props.get('name', '').lower() if material_props.get('name') else ''
-                                                        if any(keyword in material_name for keyword in ['glass', 'glazing', 'verre', 'стекло', 'vitrage', 'pane']):
+                                                        if GLAZING_KEYWORDS_RE.search(material_props.get('name') or ''):
                                                             is_window = True
                                             except:
                                                 pass
@@ -3901,10 +4115,8 @@ class IFCImporter(BaseImporter):
                                             # Method 2: Check name for window keywords
                                             if not is_window:
                                                 plate_name = element.Name if hasattr(element, 'Name') else ''
-                                                if plate_name:
-                                                    name_lower = plate_name.lower()
-                                                    if any(keyword in name_lower for keyword in ['window', 'окно', 'glazing', 'glass', 'pane', 'vitrage']):
-                                                        is_window = True
+                                                if plate_name and WINDOW_KEYWORDS_RE.search(plate_name):
+                                                    is_window = True
                                             
                                             # Method 3: Check if plate has window-like geometry
                                             if not is_window:
@@ -3925,21 +4137,15 @@ class IFCImporter(BaseImporter):
                                         elif element.is_a("IfcOpeningElement"):
                                             # Check if opening is a window (not a door)
                                             # Method 1: Check if filled by door
-                                            is_door = False
-                                            if hasattr(element, 'HasFillings'):
-                                                for filling_rel in element.HasFillings:
-                                                    if hasattr(filling_rel, 'RelatedBuildingElement'):
-                                                        if filling_rel.RelatedBuildingElement.is_a("IfcDoor"):
-                                                            is_door = True
-                                                            break
+                                            fillings_by_opening, _ = self._get_fills_index()
+                                            is_door = any(filling.is_a("IfcDoor")
+                                                          for filling in fillings_by_opening.get(element.id(), ()))
                                             
                                             # Method 2: Check name
                                             if not is_door:
-                                                opening_name = element.Name if hasattr(element, 'Name') else ''
-                                                if opening_name:
-                                                    name_lower = opening_name.lower()
-                                                    if any(keyword in name_lower for keyword in ['door', 'дверь', 'porte', 'tür', 'entrance']):
-                                                        is_door = True
+                                                opening_name = getattr(element, 'Name', None) or ''
+                                                if DOOR_KEYWORDS_RE.search(opening_name):
+                                                    is_door = True
                                             
                                             # If not a door, it's likely a window
                                             if not is_door:
@@ -3950,13 +4156,12 @@ class IFCImporter(BaseImporter):
                                         if is_window:
                                             # Check material for glass/glazing to determine transparency level
                                             try:
-                                                material_props = self._extract_material_properties(element)
+                                                material_props = self._extract_material_properties_cached(element)
                                                 if material_props:
-                                                    material_name = material_props.get('name', '').lower() if material_props.get('name') else ''
                                                     has_glazing = material_props.get('has_glazing', False)
                                                     
                                                     # If material is glass/glazing, make it more transparent
-                                                    if has_glazing or any(keyword in material_name for keyword in ['glass', 'glazing', 'verre', 'стекло', 'vitrage']):
+                                                    if has_glazing or GLAZING_KEYWORDS_RE.search(material_props.get('name') or ''):
                                                         # Glass windows: 30-40% transparent (60-70% opaque)
                                                         transparency = 0.3
                                                         logger.debug(f"Applied high transparency to {element_type} {element.id()} (glass/glazing material)")
@@ -3984,10 +4189,8 @@ class IFCImporter(BaseImporter):
                                             int(alpha * 255)
                                         ], dtype=np.uint8)
                                         
-                                        # Apply color to all faces (per-face coloring)
-                                        num_faces = len(mesh.faces)
-                                        face_colors = np.tile(color_rgba, (num_faces, 1))
-                                        mesh.visual.face_colors = face_colors
+                                        # Apply color to all faces (trimesh expands a single RGBA to every face)
+                                        mesh.visual.face_colors = color_rgba
                                         
                                         logger.debug(f"✓ Applied color to {element_type} {element.id()}: RGB({r*255:.0f}, {g*255:.0f}, {b*255:.0f}), alpha={alpha:.2f}")
                                     else:
@@ -4002,17 +4205,16 @@ class IFCImporter(BaseImporter):
                                         elif element.is_a("IfcPlate"):
                                             # Check if plate is a glazing panel
                                             try:
-                                                material_props = self._extract_material_properties(element)
+                                                material_props = self._extract_material_properties_cached(element)
                                                 if material_props and (material_props.get('has_glazing') or material_props.get('is_window_material')):
                                                     is_window = True
                                             except:
                                                 pass
                                         elif element.is_a("IfcOpeningElement"):
                                             # Check if opening is a window (not a door)
-                                            opening_name = element.Name if hasattr(element, 'Name') else ''
+                                            opening_name = getattr(element, 'Name', None) or ''
                                             if opening_name:
-                                                name_lower = opening_name.lower()
-                                                if not any(keyword in name_lower for keyword in ['door', 'дверь', 'porte', 'tür']):
+                                                if not DOOR_KEYWORDS_RE.search(opening_name):
                                                     is_window = True
                                             else:
                                                 is_window = True
@@ -4024,13 +4226,11 @@ class IFCImporter(BaseImporter):
                                             logger.debug(f"Applied transparency to {element_type} {element.id()} (window with default color)")
                                         
                                         default_color = np.array([200, 200, 200, window_alpha], dtype=np.uint8)
-                                        num_faces = len(mesh.faces)
-                                        face_colors = np.tile(default_color, (num_faces, 1))
-                                        mesh.visual.face_colors = face_colors
+                                        mesh.visual.face_colors = default_color
                                         
                                         # Log which element is missing color for debugging
                                         element_name = getattr(element, 'Name', 'Unnamed')
-                                        element_id = getattr(element, 'GlobalId', element.id())
+                                        element_id = element_metadata.get('element_global_id') or element.id()
                                         if element_type == "IfcWindow" or is_window:
                                             logger.info(f"⚠ Window '{element_name}' (ID: {element_id}) has no color but transparency applied")
                                         else:
@@ -4043,14 +4243,10 @@ class IFCImporter(BaseImporter):
                                         logger.warning(f"Error applying color to {element_type} {element.id()}: {color_error}")
                                         # Use default gray if color extraction fails
                                         # BUT: For windows, apply transparency even on error
-                                        is_window = (element_type == "IfcWindow" or 
-                                                   element.is_a("IfcPlate") or 
-                                                   element.is_a("IfcOpeningElement"))
+                                        is_window = element_type in TRANSPARENT_FALLBACK_TYPES
                                         window_alpha = int(255 * 0.75) if is_window else 255  # 75% opacity for windows
                                         default_color = np.array([200, 200, 200, window_alpha], dtype=np.uint8)
-                                        num_faces = len(mesh.faces)
-                                        face_colors = np.tile(default_color, (num_faces, 1))
-                                        mesh.visual.face_colors = face_colors
+                                        mesh.visual.face_colors = default_color
                                         if is_window:
                                             logger.debug(f"Applied transparency to {element_type} {element.id()} (window, color extraction error)")
                                     
@@ -4076,6 +4272,20 @@ class IFCImporter(BaseImporter):
                                     except Exception as meta_error:
                                         logger.debug(f"Error storing metadata: {meta_error}")
                                     
+                                    mesh_metadata = getattr(mesh, 'metadata', None)
+                                    if mesh_metadata is None:
+                                        mesh_metadata = getattr(getattr(mesh, 'visual', None), 'metadata', None)
+                                    if mesh_metadata:
+                                        if mesh_metadata.get('color_style', {}).get('color'):
+                                            metadata_counts['color'] += 1
+                                        if mesh_metadata.get('material_name'):
+                                            metadata_counts['material'] += 1
+                                            material_types[mesh_metadata.get('material_type', 'Unknown')] += 1
+                                        if mesh_metadata.get('properties'):
+                                            metadata_counts['properties'] += 1
+                                        if mesh_metadata.get('is_window'):
+                                            metadata_counts['window'] += 1
+                                    
                                     meshes.append(mesh)
                                     successful_elements += 1
                                 else:
@@ -4105,38 +4315,17 @@ class IFCImporter(BaseImporter):
             logger.info(f"  ⊘ Skipped (no geometry): {skipped_elements} ({100*skipped_elements/max(total_elements,1):.1f}%)")
             logger.info("")
             logger.info("Elements by type:")
-            for elem_type, count in sorted(element_type_counts.items(), key=lambda x: x[1], reverse=True):
+            for elem_type, count in element_type_counts.most_common():
                 logger.info(f"  {elem_type}: {count}")
             
             # METADATA EXTRACTION STATISTICS
             if meshes:
                 logger.info("")
                 logger.info("METADATA EXTRACTION SUMMARY:")
-                elements_with_color = 0
-                elements_with_material = 0
-                elements_with_properties = 0
-                window_count = 0
-                material_types = {}
-                
-                for mesh in meshes:
-                    # Check if mesh has metadata
-                    metadata = None
-                    if hasattr(mesh, 'metadata'):
-                        metadata = mesh.metadata
-                    elif hasattr(mesh, 'visual') and hasattr(mesh.visual, 'metadata'):
-                        metadata = mesh.visual.metadata
-                    
-                    if metadata:
-                        if metadata.get('color_style', {}).get('color'):
-                            elements_with_color += 1
-                        if metadata.get('material_name'):
-                            elements_with_material += 1
-                            mat_type = metadata.get('material_type', 'Unknown')
-                            material_types[mat_type] = material_types.get(mat_type, 0) + 1
-                        if metadata.get('properties'):
-                            elements_with_properties += 1
-                        if metadata.get('is_window'):
-                            window_count += 1
+                elements_with_color = metadata_counts['color']
+                elements_with_material = metadata_counts['material']
+                elements_with_properties = metadata_counts['properties']
+                window_count = metadata_counts['window']
                 
                 logger.info(f"  ✓ Elements with color: {elements_with_color}/{len(meshes)} ({100*elements_with_color/len(meshes):.1f}%)")
                 logger.info(f"  ✓ Elements with material: {elements_with_material}/{len(meshes)} ({100*elements_with_material/len(meshes):.1f}%)")
@@ -4145,7 +4334,7 @@ class IFCImporter(BaseImporter):
                 
                 if material_types:
                     logger.info("  Material types found:")
-                    for mat_type, count in sorted(material_types.items(), key=lambda x: x[1], reverse=True):
+                    for mat_type, count in material_types.most_common():
                         logger.info(f"    {mat_type}: {count}")
             
             logger.info("=" * 80)
@@ -4162,7 +4351,7 @@ class IFCImporter(BaseImporter):
                 try:
                     # Get ALL elements that might have geometry
                     all_elements = []
-                    for element_type in self.ifc_file.by_type("IfcProduct"):  # IfcProduct is base class for all spatial/geometric elements
+                    for element_type in self._cached_by_type("IfcProduct"):  # IfcProduct is base class for all spatial/geometric elements
                         try:
                             # Try to create shape for this element
                             shape = geom.create_shape(settings, element_type)
@@ -4185,9 +4374,9 @@ class IFCImporter(BaseImporter):
                                 if hasattr(geometry, 'tessellation'):
                                     tess = geometry.tessellation()
                                     if tess and isinstance(tess, tuple) and len(tess) >= 2:
-                                        vertices = np.array(tess[0], dtype=np.float64)
+                                        vertices = _as_flat_array(tess[0], np.float64)
                                         faces_data = tess[1]
-                                        faces = np.array(faces_data, dtype=np.int32)
+                                        faces = _as_flat_array(faces_data, np.int32)
                                         if len(faces.shape) == 1 and len(faces) % 3 == 0:
                                             faces = faces.reshape(-1, 3)
                             except:
@@ -4199,13 +4388,13 @@ class IFCImporter(BaseImporter):
                                     verts = geometry.verts
                                     faces_data = geometry.faces
                                     
-                                    vertices = np.array(verts, dtype=np.float64)
+                                    vertices = _as_flat_array(verts, np.float64)
                                     if len(vertices.shape) == 1 and len(vertices) % 3 == 0:
                                         vertices = vertices.reshape(-1, 3)
                                     elif len(vertices.shape) != 2 or vertices.shape[1] != 3:
                                         continue
                                     
-                                    faces = np.array(faces_data, dtype=np.int32)
+                                    faces = _as_flat_array(faces_data, np.int32)
                                     if len(faces.shape) == 1 and len(faces) % 3 == 0:
                                         faces = faces.reshape(-1, 3)
                                     elif len(faces.shape) != 2 or faces.shape[1] != 3:
@@ -4221,9 +4410,7 @@ class IFCImporter(BaseImporter):
                                     if len(mesh.vertices) > 0 and len(mesh.faces) > 0:
                                         # Apply default color
                                         default_color = np.array([200, 200, 200, 255], dtype=np.uint8)
-                                        num_faces = len(mesh.faces)
-                                        face_colors = np.tile(default_color, (num_faces, 1))
-                                        mesh.visual.face_colors = face_colors
+                                        mesh.visual.face_colors = default_color
                                         meshes.append(mesh)
                                         successful_elements += 1
                         except Exception as e:
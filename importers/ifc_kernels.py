@@ -0,0 +1,55 @@
+"""
+Numeric kernels used by the IFC importer.
+Plain Python/NumPy: the importer calls them per element on scalars or small vertex
+arrays, where JIT compilation and dispatch would cost more than the work itself.
+"""
+
+import numpy as np
+
+# Window-like geometry limits (metres) used by window_shape_score
+SHAPE_MIN_SIZE = 0.3  # 30cm minimum
+SHAPE_MAX_WIDTH = 5.0  # 5m maximum width
+SHAPE_MAX_HEIGHT = 4.0  # 4m maximum height
+SHAPE_TYPICAL_MIN = 0.5  # Typical windows are 0.5m - 2.5m in both directions
+SHAPE_TYPICAL_MAX = 2.5
+
+# window_shape_score results
+SHAPE_REJECTED = 0  # Outside plausible window dimensions
+SHAPE_PLAUSIBLE = 1  # Plausible, needs material/name evidence
+SHAPE_TYPICAL = 2  # Typical window dimensions
+
+
+def window_shape_score(width: float, height: float) -> int:
+    """
+    Classify window dimensions.
+
+    Args:
+        width: Window width in metres
+        height: Window height in metres
+
+    Returns:
+        SHAPE_REJECTED, SHAPE_PLAUSIBLE or SHAPE_TYPICAL
+    """
+    if width < SHAPE_MIN_SIZE or height < SHAPE_MIN_SIZE:
+        return SHAPE_REJECTED
+    if width > SHAPE_MAX_WIDTH or height > SHAPE_MAX_HEIGHT:
+        return SHAPE_REJECTED
+    if (SHAPE_TYPICAL_MIN <= width <= SHAPE_TYPICAL_MAX
+            and SHAPE_TYPICAL_MIN <= height <= SHAPE_TYPICAL_MAX):
+        return SHAPE_TYPICAL
+    return SHAPE_PLAUSIBLE
+
+
+def apply_affine(vertices: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Apply the affine part of a 4x4 transformation matrix to vertices
+    (v' = M[:3, :3] @ v + M[:3, 3]), without building homogeneous coordinates.
+
+    Args:
+        vertices: Float64 array of shape (N, 3)
+        matrix: Float64 array of shape (4, 4)
+
+    Returns:
+        Transformed float64 array of shape (N, 3)
+    """
+    return vertices @ matrix[:3, :3].T + matrix[:3, 3]